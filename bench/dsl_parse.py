@@ -0,0 +1,60 @@
+"""
+DSL parser scaling on pathological expressions.
+
+Parses deeply nested and very wide expressions of growing size with the
+caches bypassed, and prints the time per character: roughly constant down a
+column means the parser is linear in the length of the expression.
+
+    python bench/dsl_parse.py
+    python bench/dsl_parse.py --sizes 32 64 128 256 --repeat 5
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.dsl import random_dsl  # noqa: E402
+
+SHAPES = {
+    # l[l[l[...l[1, 2]...]]]
+    "nested lists": lambda n: "l[" * n + "1, 2" + "]" * n,
+    # r[0, r[1, r[2, ... ]]]: every level is the max bound of the one above
+    "nested ranges": lambda n: "".join(f"r[{i}, " for i in range(n)) + str(n) + "]" * n,
+    # wl[(wl[(...wl[(1, 1)]..., 1)], 1)]: nesting inside weighted pairs
+    "nested weights": lambda n: "wl[(" * n + "1" + ", 1)]" * n,
+    # l[r[0,1], r[1,2], ...]: one long level
+    "wide list": lambda n: "l[" + ", ".join(f"r[{i}, {i + 1}]" for i in range(n * 8)) + "]",
+}
+
+def time_parse(expr: str, repeat: int) -> float:
+    """Best wall time of an uncached parse, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        random_dsl._interned.clear()
+        start = time.perf_counter()
+        random_dsl._parse(expr)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64, 128, 256], help="nesting depths / widths")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per expression; the fastest is kept")
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(args.sizes)))
+    print(f"{'shape':<16} {'size':>6} {'chars':>8} {'ms':>9} {'us/char':>9}")
+    for name, make in SHAPES.items():
+        per_char = []
+        for n in args.sizes:
+            expr = make(n)
+            seconds = time_parse(expr, args.repeat)
+            per_char.append(seconds * 1e6 / len(expr))
+            print(f"{name:<16} {n:>6} {len(expr):>8} {seconds * 1000:>9.2f} {per_char[-1]:>9.3f}")
+        print(f"{'':<16} growth of us/char from smallest to largest: x{per_char[-1] / per_char[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
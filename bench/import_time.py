@@ -0,0 +1,66 @@
+"""
+Import time of a module or snippet, aggregated per package.
+
+Runs the target in a fresh interpreter with `-X importtime` (several times,
+keeping the fastest run of each module) and sums self time by the first
+`--depth` components of the module name.
+
+    python bench/import_time.py                       # import main
+    python bench/import_time.py -c "from core.registry import registry; registry.get('moves')"
+    python bench/import_time.py --depth 1 --runs 5
+"""
+import argparse
+from collections import defaultdict
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_once(code: str) -> dict[str, int]:
+    """Self import time in microseconds per module for one cold run."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--code", default="import main", help="code to time (default: import main)")
+    parser.add_argument("--runs", type=int, default=3, help="runs; the fastest time of each module is kept")
+    parser.add_argument("--depth", type=int, default=2, help="module name components to group by")
+    parser.add_argument("--top", type=int, default=20, help="groups to list")
+    args = parser.parse_args()
+
+    best: dict[str, int] = {}
+    for _ in range(args.runs):
+        for name, us in run_once(args.code).items():
+            best[name] = min(us, best.get(name, us))
+
+    groups: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    for name, us in best.items():
+        group = groups[".".join(name.split(".")[:args.depth])]
+        group[0] += us
+        group[1] += 1
+
+    total = sum(best.values())
+    print(f"{'package':<40} {'ms':>9} {'%':>6} {'modules':>8}")
+    for name, (us, count) in sorted(groups.items(), key=lambda g: -g[1][0])[:args.top]:
+        print(f"{name:<40} {us / 1000:>9.1f} {100 * us / total:>6.1f} {count:>8}")
+    print(f"{'total':<40} {total / 1000:>9.1f} {100.0:>6.1f} {len(best):>8}")
+
+
+if __name__ == "__main__":
+    main()
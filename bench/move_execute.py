@@ -0,0 +1,75 @@
+"""
+MoveEngine overhead per move execution.
+
+Executes every loaded move with the leaf action handlers (damage, buff...)
+replaced by no-ops, so what is timed is the engine's own work: context
+propagation, chance gates, dispatch and the control actions (repeat, random,
+condition). Timed with and without a runtime context override, and with
+MoveEngine profiling enabled.
+
+    python bench/move_execute.py
+    python bench/move_execute.py --rounds 200
+"""
+import argparse
+import os
+from pathlib import Path
+import sys
+import time
+import warnings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("BRANLY_HEADLESS", "1")
+
+import systems.battle, systems.fighters, systems.moves  # noqa: E402,F401
+from core.registry import registry  # noqa: E402
+from systems.battle.schema import Battle  # noqa: E402
+from systems.moves.engine import MoveEngine  # noqa: E402
+from systems.moves.handlers import ACTION_HANDLERS  # noqa: E402
+from systems.moves.schema import MoveContext  # noqa: E402
+
+CONTROL = ("condition", "random", "repeat")
+
+class Noop:
+    def execute(self, *args, **kwargs):
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100, help="executions of every move per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements; the fastest is kept")
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        registry.build_all()
+    moves = registry.get("moves").set
+    handlers = {hid: h if hid in CONTROL else Noop() for hid, h in ACTION_HANDLERS.items()}
+    engine = MoveEngine(set=moves, registry=registry, action_handlers=handlers)
+
+    fighters = list(registry.get("fighters").set.keys())
+    battle = Battle.from_sides("bench", [[fighters[0]], [fighters[-1]]], seed=0)
+    ctx = battle.current_context
+    user, target = ctx.sides[0][0], ctx.sides[1][0]
+    move_ids = list(moves.keys())
+
+    print(f"{len(move_ids)} moves, {sum(len(m.actions) for m in moves.values())} top-level actions")
+    runs = (("no override", None, False), ("runtime override", MoveContext(mult=2.0), False), ("profiled", None, True))
+    for label, runtime_ctx, profiled in runs:
+        if profiled:
+            engine.enable_profiling()
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for move_id in move_ids:
+                    user.current_stats.charge = 10**9
+                    engine.execute(move_id, user, target, ctx, runtime_ctx)
+                ctx.events.drain()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<18} {best / (args.rounds * len(move_ids)) * 1e6:>8.2f} us/move")
+        if profiled:
+            engine.disable_profiling()
+
+
+if __name__ == "__main__":
+    main()
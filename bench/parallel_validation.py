@@ -0,0 +1,66 @@
+"""
+Serial vs process-pool validation of a large move pack.
+
+Builds packs of N moves by copying data/moves.json under new ids and times
+SystemRegistry._validate in-process and on a pool of --workers processes
+(pool start-up timed separately). MIN_PARALLEL_ENTRIES in core.registry is
+set from these numbers.
+
+    python bench/parallel_validation.py
+    python bench/parallel_validation.py --sizes 600 2500 10000 --workers 4
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+import time
+import warnings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("BRANLY_HEADLESS", "1")
+os.environ["BRANLY_SNAPSHOTS"] = "0"
+
+import systems.moves  # noqa: E402,F401
+from core import registry as registry_module  # noqa: E402
+from core.registry import DATA_ROOT, registry  # noqa: E402
+
+def pack(moves: list[dict], size: int) -> list[dict]:
+    return [{**moves[i % len(moves)], "id": f"bench_{i}"} for i in range(size)]
+
+def time_validate(reg, spec, moves: list[dict], size: int) -> float:
+    raw = json.loads(json.dumps(pack(moves, size)))  # validators coerce in place
+    start = time.perf_counter()
+    reg._validate(spec, raw)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 600, 2500, 10000], help="entries per pack")
+    parser.add_argument("--workers", type=int, default=2, help="validation processes")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    moves = json.loads((DATA_ROOT / "moves.json").read_bytes())
+    serial = registry.derive(DATA_ROOT, snapshot_dir=None, validation_workers=0)
+    parallel = registry.derive(DATA_ROOT, snapshot_dir=None, validation_workers=args.workers)
+    for reg in (serial, parallel):
+        reg.get("types")
+    spec = serial.spec("moves")
+
+    # force the pool path whatever the threshold and CPU count, to measure it
+    registry_module.MIN_PARALLEL_ENTRIES = 0
+    registry_module._usable_cpus = lambda: args.workers
+    start = time.perf_counter()
+    parallel._validate(spec, json.loads(json.dumps(pack(moves, 1))))
+    print(f"{os.cpu_count()} CPUs, pool of {args.workers} started in {time.perf_counter() - start:.3f} s")
+
+    print(f"{'entries':>8} {'serial':>10} {'pool':>10}")
+    for size in args.sizes:
+        s = time_validate(serial, spec, moves, size)
+        p = time_validate(parallel, spec, moves, size)
+        print(f"{size:>8} {s:>9.3f}s {p:>9.3f}s   ({s / size * 1e3:.2f} / {p / size * 1e3:.2f} ms per entry)")
+
+
+if __name__ == "__main__":
+    main()
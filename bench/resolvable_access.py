@@ -0,0 +1,73 @@
+"""
+Attribute read cost on ResolvableModel fields.
+
+Times reads of a plain field (an int-typed field), a DSL-typed field holding
+a plain value, and a DSL-typed field holding a DSL node. Each is timed on the
+current ResolvableModel, on the previous implementation (a __getattribute__
+override resolving every field read), and on a plain pydantic model.
+
+    python bench/resolvable_access.py
+    python bench/resolvable_access.py --number 500000
+"""
+import argparse
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import BaseModel  # noqa: E402
+
+from core.dsl.random_dsl import RNUM, parse_dsl  # noqa: E402
+from core.dsl.resolvable import ResolvableModel  # noqa: E402
+from core.utils.callables import call_if_zero_arg  # noqa: E402
+
+
+class Current(ResolvableModel):
+    plain: int = 1
+    number: RNUM = 2.0
+    dsl: RNUM = 0.0
+
+class Legacy(BaseModel):
+    """ResolvableModel before per-field classification."""
+    plain: int = 1
+    number: RNUM = 2.0
+    dsl: RNUM = 0.0
+
+    def __getattribute__(self, name: str):
+        value = super().__getattribute__(name)
+        if name not in type(self).model_fields:
+            return value
+        return call_if_zero_arg(value)
+
+class Plain(BaseModel):
+    plain: int = 1
+    number: float = 2.0
+    dsl: float = 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000, help="reads per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements; the fastest is kept")
+    args = parser.parse_args()
+
+    dsl = parse_dsl("r[1, 5]")
+    models = {
+        "pydantic": Plain(),
+        "legacy": Legacy(dsl=dsl),
+        "current": Current(dsl=dsl),
+    }
+    print(f"{'field':<14} " + " ".join(f"{name + ' ns':>12}" for name in models) + f" {'speedup':>9}")
+    for field in ("plain", "number", "dsl"):
+        ns = {}
+        for name, model in models.items():
+            if name == "pydantic" and field == "dsl":
+                ns[name] = float("nan")
+                continue
+            timer = timeit.Timer(f"m.{field}", globals={"m": model})
+            ns[name] = min(timer.repeat(args.repeat, args.number)) / args.number * 1e9
+        print(f"{field:<14} " + " ".join(f"{ns[name]:>12.1f}" for name in models) + f" {ns['legacy'] / ns['current']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,12 @@
 pyinstaller --onefile --windowed main.py \
     --hidden-import=pygame._sdl2 \
     --hidden-import=pygame_gui.core \
+    --hidden-import=systems.types \
+    --hidden-import=systems.moves \
+    --hidden-import=systems.fighters \
+    --hidden-import=systems.battle \
+    --hidden-import=systems.audio \
+    --hidden-import=systems.display \
     --add-data "assets:assets" \
     --add-data "data:data" \
     --name "Branlys_Gambit"
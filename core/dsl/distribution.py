@@ -0,0 +1,126 @@
+import math
+from typing import Any, Iterable
+
+# -------------------------
+# Distributions
+# -------------------------
+# Closed-form distributions of DSL values, built bottom-up from the node tree
+# (see DSLNode.distribution). Choices are mixtures of their items, ranges are
+# uniform between independently drawn bounds.
+class Distribution:
+    """
+    Distribution of a DSL value.
+      - pmf: {value: probability} for discrete values, None for continuous ones
+      - mean, variance, min, max: None for non-numeric values
+      - exact: False when the moments are approximate (rounding a range whose
+        bounds are themselves continuous)
+    """
+    __slots__ = ("pmf", "mean", "variance", "min", "max", "exact")
+
+    def __init__(self, pmf: dict | None, mean: float | None, variance: float | None, min: Any, max: Any, exact: bool = True):
+        self.pmf = pmf
+        self.mean = mean
+        self.variance = variance
+        self.min = min
+        self.max = max
+        self.exact = exact
+
+    @property
+    def std(self) -> float | None:
+        return None if self.variance is None else math.sqrt(self.variance)
+
+    @property
+    def numeric(self) -> bool:
+        return self.mean is not None
+
+    @classmethod
+    def point(cls, value: Any) -> "Distribution":
+        try:
+            pmf = {value: 1.0}
+        except TypeError:
+            pmf = None  # unhashable literal (e.g. a list value)
+        if _is_number(value):
+            return cls(pmf, value, 0.0, value, value)
+        return cls(pmf, None, None, None, None)
+
+    @classmethod
+    def from_pmf(cls, pmf: dict, exact: bool = True) -> "Distribution":
+        if not all(_is_number(v) for v in pmf):
+            return cls(pmf, None, None, None, None, exact)
+        mean = sum(v * p for v, p in pmf.items())
+        second = sum(v * v * p for v, p in pmf.items())
+        return cls(pmf, mean, max(0.0, second - mean * mean), min(pmf), max(pmf), exact)
+
+    def second_moment(self) -> float:
+        return self.variance + self.mean * self.mean
+
+    def __repr__(self):
+        if not self.numeric:
+            return f"Distribution(pmf={self.pmf})"
+        kind = "discrete" if self.pmf is not None else "continuous"
+        return f"Distribution({kind}, mean={self.mean:g}, std={self.std:g}, min={self.min}, max={self.max})"
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+# -------------------------
+# Combinators
+# -------------------------
+def mixture(parts: Iterable[tuple[Distribution, float]]) -> Distribution:
+    """Pick one of the distributions with the given probabilities (summing to 1)."""
+    parts = [(d, w) for d, w in parts if w > 0]
+    exact = all(d.exact for d, _ in parts)
+    pmf = None
+    if all(d.pmf is not None for d, _ in parts):
+        pmf = {}
+        for d, w in parts:
+            for v, p in d.pmf.items():
+                pmf[v] = pmf.get(v, 0.0) + w * p
+    if not all(d.numeric for d, _ in parts):
+        return Distribution(pmf, None, None, None, None, exact)
+    mean = sum(w * d.mean for d, w in parts)
+    second = sum(w * d.second_moment() for d, w in parts)
+    return Distribution(
+        pmf, mean, max(0.0, second - mean * mean),
+        min(d.min for d, _ in parts), max(d.max for d, _ in parts), exact,
+    )
+
+def uniform(lo: Distribution, hi: Distribution) -> Distribution:
+    """Uniform between two independent bounds: X = L + (H - L) * U."""
+    if not (lo.numeric and hi.numeric):
+        raise TypeError("Range bounds must be numeric")
+    exact = lo.exact and hi.exact
+    if lo.variance == 0 and hi.variance == 0 and lo.mean == hi.mean:
+        return Distribution({lo.mean: 1.0}, lo.mean, 0.0, lo.mean, lo.mean, exact)
+    mean = (lo.mean + hi.mean) / 2
+    second = (lo.second_moment() + lo.mean * hi.mean + hi.second_moment()) / 3
+    return Distribution(
+        None, mean, max(0.0, second - mean * mean),
+        min(lo.min, hi.min), max(lo.max, hi.max), exact,
+    )
+
+def rounded_uniform(a: float, b: float) -> Distribution:
+    """int(round(X)) for X uniform on [a, b]: each integer gets the length of its half-unit cell."""
+    if a > b:
+        a, b = b, a
+    if a == b:
+        return Distribution.point(int(round(a)))
+    pmf = {}
+    for k in range(math.floor(a + 0.5), math.ceil(b - 0.5) + 1):
+        width = min(b, k + 0.5) - max(a, k - 0.5)
+        if width > 0:
+            pmf[k] = width / (b - a)
+    return Distribution.from_pmf(pmf)
+
+def rounded(dist: Distribution) -> Distribution:
+    """int(round(X)) for a discrete X; for a continuous X only approximate moments."""
+    if dist.pmf is not None:
+        pmf = {}
+        for v, p in dist.pmf.items():
+            k = int(round(v))
+            pmf[k] = pmf.get(k, 0.0) + p
+        return Distribution.from_pmf(pmf, dist.exact)
+    # rounding adds about 1/12 to the variance (Sheppard's correction)
+    return Distribution(
+        None, dist.mean, dist.variance + 1 / 12, int(round(dist.min)), int(round(dist.max)), exact=False,
+    )
@@ -0,0 +1,237 @@
+import ast
+from collections import Counter
+import functools
+import operator
+from typing import Any, Callable
+
+from core.dsl.nodes import DSLNode
+
+# -------------------------
+# Abstract values
+# -------------------------
+class Dom:
+    """
+    Every value a variable can take: finite `points` plus closed numeric
+    `intervals` (lo, hi), as produced by DSL ranges.
+    """
+    __slots__ = ("points", "intervals")
+
+    def __init__(self, points: tuple = (), intervals: tuple = ()):
+        self.points = points
+        self.intervals = intervals
+
+    @classmethod
+    def of(cls, value: Any) -> "Dom":
+        if isinstance(value, DSLNode):
+            dom = value.domain
+        elif callable(value):
+            dom = getattr(value, "_domain", None)
+        else:
+            return cls((value,))
+        if dom is None:
+            raise ValueError("Callable has no domain metadata")
+        if isinstance(dom, tuple):
+            return cls((), (dom,))
+        points, intervals = [], []
+        for d in dom:
+            if _is_range(d):
+                intervals.append(d)
+            else:
+                points.append(d)
+        return cls(tuple(points), tuple(intervals))
+
+    def bounds(self) -> tuple[Any, Any] | None:
+        """(min, max) if every value is a number, else None."""
+        if not all(_is_number(p) for p in self.points):
+            return None
+        los = [*self.points, *(lo for lo, _ in self.intervals)]
+        his = [*self.points, *(hi for _, hi in self.intervals)]
+        return min(los), max(his)
+
+    def values(self) -> tuple:
+        """The finite values, if there are no proper intervals."""
+        if any(lo != hi for lo, hi in self.intervals):
+            raise _Undecidable
+        return self.points + tuple(lo for lo, _ in self.intervals)
+
+    def __repr__(self):
+        parts = [repr(p) for p in self.points] + [f"[{lo}, {hi}]" for lo, hi in self.intervals]
+        return parts[0] if len(parts) == 1 else "{" + ", ".join(parts) + "}"
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float))
+
+def _is_range(v: Any) -> bool:
+    return isinstance(v, tuple) and len(v) == 2 and all(_is_number(x) for x in v)
+
+class _Undecidable(Exception):
+    """The expression can't be decided over intervals."""
+
+class Unsupported(Exception):
+    """The expression is outside the subset compile_check understands."""
+
+# -------------------------
+# Operations over domains
+# -------------------------
+def _arith(op: Callable, a: Dom, b: Dom) -> Dom:
+    if a.intervals or b.intervals:
+        ab, bb = a.bounds(), b.bounds()
+        if ab is None or bb is None:
+            raise _Undecidable
+        if op is operator.add:
+            return Dom((), ((ab[0] + bb[0], ab[1] + bb[1]),))
+        return Dom((), ((ab[0] - bb[1], ab[1] - bb[0]),))
+    return Dom(tuple(op(x, y) for x in a.points for y in b.points))
+
+def _neg(a: Dom) -> Dom:
+    return Dom(tuple(-p for p in a.points), tuple((-hi, -lo) for lo, hi in a.intervals))
+
+def _len(a: Dom) -> Dom:
+    if a.intervals:
+        raise _Undecidable
+    return Dom(tuple(len(p) for p in a.points))
+
+_ORDER = {
+    ast.Lt: lambda l, r: l[1] < r[0],
+    ast.LtE: lambda l, r: l[1] <= r[0],
+    ast.Gt: lambda l, r: l[0] > r[1],
+    ast.GtE: lambda l, r: l[0] >= r[1],
+}
+_CONCRETE = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+def _holds(op: ast.cmpop, left: Dom, right: Dom) -> bool:
+    """Whether `left op right` holds for every pair of values."""
+    kind = type(op)
+    if kind in _ORDER and (left.intervals or right.intervals):
+        lb, rb = left.bounds(), right.bounds()
+        if lb is None or rb is None:
+            raise _Undecidable
+        return _ORDER[kind](lb, rb)
+    if kind is ast.NotEq and (left.intervals or right.intervals):
+        # every value differs iff the two domains don't overlap
+        return all(
+            not (lo1 <= hi2 and lo2 <= hi1)
+            for lo1, hi1 in _as_intervals(left) for lo2, hi2 in _as_intervals(right)
+        )
+    if kind in (ast.In, ast.NotIn):
+        containers = right.values()
+        if kind is ast.In:
+            return all(v in c for v in left.values() for c in containers)
+        if any(lo <= x <= hi for lo, hi in left.intervals for c in containers for x in c if _is_number(x)):
+            return False
+        return all(v not in c for v in left.points for c in containers)
+    if kind in _CONCRETE:
+        cmp = _CONCRETE[kind]
+        return all(cmp(l, r) for l in left.values() for r in right.values())
+    raise _Undecidable
+
+def _as_intervals(d: Dom) -> list[tuple]:
+    if not all(_is_number(p) for p in d.points):
+        raise _Undecidable
+    return [(p, p) for p in d.points] + list(d.intervals)
+
+# -------------------------
+# Compiler
+# -------------------------
+Env = dict[str, Dom]
+
+def _expr(node: ast.expr) -> Callable[[Env], Dom]:
+    if isinstance(node, ast.Name):
+        name = node.id
+        def var(env: Env) -> Dom:
+            try:
+                return env[name]
+            except KeyError:
+                raise NameError(f"name '{name}' is not defined") from None
+        return var
+    if isinstance(node, (ast.Constant, ast.Tuple, ast.List)):
+        try:
+            value = ast.literal_eval(node)
+        except ValueError:
+            raise Unsupported(ast.dump(node))
+        const = Dom((value,))
+        return lambda env: const
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        op = operator.add if isinstance(node.op, ast.Add) else operator.sub
+        left, right = _expr(node.left), _expr(node.right)
+        return lambda env: _arith(op, left(env), right(env))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        operand = _expr(node.operand)
+        return lambda env: _neg(operand(env))
+    if (
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "len"
+        and len(node.args) == 1 and not node.keywords
+    ):
+        arg = _expr(node.args[0])
+        return lambda env: _len(arg(env))
+    raise Unsupported(ast.dump(node))
+
+def _predicate(node: ast.expr) -> Callable[[Env], bool]:
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+        # "holds for all values" distributes over `and` (not over `or` / `not`)
+        parts = [_predicate(v) for v in node.values]
+        return lambda env: all(p(env) for p in parts)
+    if isinstance(node, ast.Compare):
+        operands = [_expr(node.left), *(_expr(c) for c in node.comparators)]
+        ops = node.ops
+
+        def compare(env: Env) -> bool:
+            values = [o(env) for o in operands]
+            return all(_holds(op, values[i], values[i + 1]) for i, op in enumerate(ops))
+
+        repeated = _repeated_variables(node)
+        if repeated:
+            # operands are evaluated as if every occurrence of a variable were
+            # independent (x - x spans [lo - hi, hi - lo]): no exact verdict
+            # unless those variables hold a single value
+            def compare_single(env: Env) -> bool:
+                if not all(_single(env[name]) for name in repeated if name in env):
+                    raise _Undecidable
+                return compare(env)
+            return compare_single
+        return compare
+    raise Unsupported(ast.dump(node))
+
+def _repeated_variables(node: ast.Compare) -> list[str]:
+    """Variables occurring more than once in one (chained) comparison."""
+    names = Counter(n.id for n in ast.walk(node) if isinstance(n, ast.Name))
+    names.subtract(n.func.id for n in ast.walk(node) if isinstance(n, ast.Call) and isinstance(n.func, ast.Name))
+    return [name for name, count in names.items() if count > 1]
+
+def _single(d: Dom) -> bool:
+    return len(d.points) + len(d.intervals) == 1 and all(lo == hi for lo, hi in d.intervals)
+
+@functools.lru_cache(maxsize=512)
+def compile_check(expr: str) -> Callable[[Env], bool]:
+    """
+    Compile a check expression to a predicate over variable domains that is
+    true iff the expression holds for every combination of values.
+
+    Supports chained comparisons, `in` / `not in`, `and`, `+` / `-`, `len()`
+    and literals. Raises Unsupported for anything else. A comparison using
+    a variable twice is left undecided unless that variable holds a single
+    value, since each occurrence would range independently.
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        raise Unsupported(expr)
+    return _predicate(tree.body)
+
+def holds(expr: str, env: Env) -> bool | None:
+    """
+    Decide `expr` over `env`: True/False, or None if it can't be decided
+    symbolically (unsupported syntax, intervals where only points make sense,
+    repeated variables, or values the operators reject, e.g. str vs number).
+    """
+    try:
+        predicate = compile_check(expr)
+    except Unsupported:
+        return None
+    try:
+        return predicate(env)
+    except (_Undecidable, TypeError, ArithmeticError):
+        return None
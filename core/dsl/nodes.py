@@ -0,0 +1,242 @@
+import random
+from itertools import accumulate
+from typing import Any, Callable
+
+from core.dsl.distribution import Distribution, mixture, rounded, rounded_uniform, uniform
+from core.rng import current_rng
+
+# -------------------------
+# DSL nodes
+# -------------------------
+# Parsed DSL expressions. Nodes are immutable (parse_dsl interns them, so one
+# node is shared by every entry using the same expression), carry their
+# domain precomputed, and pickle by value.
+class DSLNode:
+    """
+    Base class of parsed DSL expressions.
+      - sample(rng): draw a value with a random.Random (or the random module)
+      - node(): same, with the generator bound by core.rng.use_rng (else the random module)
+      - sample_n(rng, n): n draws as a numpy array, rng a numpy Generator
+      - distribution(): closed-form Distribution (mean, variance, bounds, PMF)
+      - domain: set of possible values, (min, max) tuples for ranges
+    """
+    __slots__ = ("domain", "source")
+
+    def sample(self, rng: Any = random) -> Any:
+        raise NotImplementedError
+
+    def sample_n(self, rng: Any, n: int):
+        raise NotImplementedError
+
+    def distribution(self) -> Distribution:
+        raise NotImplementedError
+
+    def rounded_distribution(self) -> Distribution:
+        """Distribution of int(round(value))."""
+        return rounded(self.distribution())
+
+    def __call__(self) -> Any:
+        return self.sample(current_rng())
+
+    @property
+    def _domain(self):
+        return self.domain
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.source!r})"
+
+class Const(DSLNode):
+    """A literal item inside a composite expression."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.source = value
+        try:
+            self.domain = {value}
+        except TypeError:
+            self.domain = [value]
+
+    def sample(self, rng: Any = random) -> Any:
+        return self.value
+
+    def sample_n(self, rng: Any, n: int):
+        import numpy as np
+        return np.full(n, self.value)
+
+    def distribution(self) -> Distribution:
+        return Distribution.point(self.value)
+
+class Range(DSLNode):
+    """r[min, max]: uniform float between two (possibly random) bounds."""
+    __slots__ = ("lo", "hi")
+
+    def __init__(self, lo: DSLNode, hi: DSLNode, source: str):
+        self.lo = lo
+        self.hi = hi
+        self.source = source
+        self.domain = (_lower(lo), _upper(hi))
+
+    def sample(self, rng: Any = random) -> float:
+        return rng.uniform(self.lo.sample(rng), self.hi.sample(rng))
+
+    def sample_n(self, rng: Any, n: int):
+        lo = self.lo.value if isinstance(self.lo, Const) else self.lo.sample_n(rng, n)
+        hi = self.hi.value if isinstance(self.hi, Const) else self.hi.sample_n(rng, n)
+        return rng.uniform(lo, hi, n)
+
+    def distribution(self) -> Distribution:
+        return uniform(self.lo.distribution(), self.hi.distribution())
+
+    def rounded_distribution(self) -> Distribution:
+        lo, hi = self.lo.distribution(), self.hi.distribution()
+        if lo.pmf is None or hi.pmf is None:
+            return rounded(uniform(lo, hi))
+        return mixture(
+            (rounded_uniform(a, b), pa * pb)
+            for a, pa in lo.pmf.items() for b, pb in hi.pmf.items()
+        )
+
+class Choice(DSLNode):
+    """l[a, b, ...]: one of the items, uniformly."""
+    __slots__ = ("choices",)
+
+    def __init__(self, choices: list[DSLNode], source: Any):
+        self.choices = tuple(choices)
+        self.source = source
+        self.domain = _union_domain(self.choices)
+
+    def sample(self, rng: Any = random) -> Any:
+        return rng.choice(self.choices).sample(rng)
+
+    def sample_n(self, rng: Any, n: int):
+        return _gather(self.choices, rng.integers(len(self.choices), size=n), rng)
+
+    def distribution(self) -> Distribution:
+        w = 1 / len(self.choices)
+        return mixture((c.distribution(), w) for c in self.choices)
+
+    def rounded_distribution(self) -> Distribution:
+        w = 1 / len(self.choices)
+        return mixture((c.rounded_distribution(), w) for c in self.choices)
+
+class WeightedChoice(DSLNode):
+    """wl[(a, w), ...]: one of the items with probability proportional to its weight."""
+    __slots__ = ("choices", "cum_weights")
+
+    def __init__(self, choices: list[DSLNode], weights: list[float], source: str):
+        self.choices = tuple(choices)
+        self.cum_weights = tuple(accumulate(weights))
+        self.source = source
+        self.domain = _union_domain(self.choices)
+
+    def sample(self, rng: Any = random) -> Any:
+        return rng.choices(self.choices, cum_weights=self.cum_weights, k=1)[0].sample(rng)
+
+    def sample_n(self, rng: Any, n: int):
+        import numpy as np
+        picks = rng.random(n) * self.cum_weights[-1]
+        return _gather(self.choices, np.searchsorted(self.cum_weights, picks, side="right"), rng)
+
+    def weights(self) -> list[float]:
+        """Probability of each item."""
+        total, prev, out = self.cum_weights[-1], 0, []
+        for cw in self.cum_weights:
+            out.append((cw - prev) / total)
+            prev = cw
+        return out
+
+    def distribution(self) -> Distribution:
+        return mixture(zip((c.distribution() for c in self.choices), self.weights()))
+
+    def rounded_distribution(self) -> Distribution:
+        return mixture(zip((c.rounded_distribution() for c in self.choices), self.weights()))
+
+class Rounded(DSLNode):
+    """Integer field wrapper (RandomInt): the inner value rounded to an int."""
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: DSLNode | Callable[[], Any]):
+        self.inner = inner
+        self.source = getattr(inner, "source", None)
+        dom = inner.domain if isinstance(inner, DSLNode) else getattr(inner, "_domain", None)
+        try:
+            self.domain = {int(round(x)) for x in dom} if isinstance(dom, set) else dom
+        except Exception:
+            self.domain = None  # e.g. a list mixing values and ranges
+
+    def sample(self, rng: Any = random) -> int:
+        inner = self.inner
+        return int(round(inner.sample(rng) if isinstance(inner, DSLNode) else inner()))
+
+    def sample_n(self, rng: Any, n: int):
+        import numpy as np
+        inner = self.inner
+        values = inner.sample_n(rng, n) if isinstance(inner, DSLNode) else np.fromiter((inner() for _ in range(n)), float, n)
+        # np.rint rounds half to even, like round()
+        return np.rint(values).astype(np.int64)
+
+    def distribution(self) -> Distribution:
+        if not isinstance(self.inner, DSLNode):
+            raise ValueError("Callable has no distribution metadata")
+        return self.inner.rounded_distribution()
+
+    def rounded_distribution(self) -> Distribution:
+        return self.distribution()
+
+# -------------------------
+# Batch helpers
+# -------------------------
+def _gather(choices: tuple[DSLNode, ...], picks, rng: Any):
+    """Array of draws where draw i comes from choices[picks[i]]."""
+    import numpy as np
+    if all(isinstance(c, Const) for c in choices):
+        return np.array([c.value for c in choices])[picks]
+    parts = {}
+    for k, c in enumerate(choices):
+        mask = picks == k
+        count = int(mask.sum())
+        if count:
+            parts[k] = (mask, c.sample_n(rng, count))
+    if not parts:
+        return np.empty(0)
+    out = np.empty(len(picks), dtype=np.result_type(*(values for _, values in parts.values())))
+    for mask, values in parts.values():
+        out[mask] = values
+    return out
+
+# -------------------------
+# Domain helpers
+# -------------------------
+def _union_domain(choices: tuple[DSLNode, ...]) -> set:
+    """Symbolic domain of a choice: the items' values, plus (min, max) for ranges."""
+    dom = set()
+    for c in choices:
+        d = c.domain
+        if isinstance(d, tuple) and all(isinstance(x, (int, float)) for x in d):
+            dom.add(d)
+        elif isinstance(d, set):
+            dom.update(d)
+    return dom
+
+def _lower(node: DSLNode):
+    dom = node.domain
+    if isinstance(dom, set):
+        return min(dom)
+    if isinstance(dom, tuple):
+        return dom[0]
+    raise TypeError("Invalid domain for range min")
+
+def _upper(node: DSLNode):
+    dom = node.domain
+    if isinstance(dom, set):
+        return max(dom)
+    if isinstance(dom, tuple):
+        return dom[1]
+    raise TypeError("Invalid domain for range max")
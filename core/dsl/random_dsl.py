@@ -1,150 +1,275 @@
-import random
+import functools
+import threading
 from typing import Any, Callable, Union
 from itertools import product
 
+from core.dsl.distribution import Distribution
+from core.dsl.intervals import Dom, Unsupported, compile_check, holds
+from core.dsl.nodes import Choice, Const, DSLNode, Range, Rounded, WeightedChoice
+from core.profiling import profiled
 from core.utils.callables import call_if_zero_arg
 
-# -------------------------
-# DSL core
-# -------------------------
-def parse_list_content(s: str) -> list:
-    """Split list string content into top-level items, respecting nested brackets."""
-    items = []
-    depth = 0
-    current = ""
-    for c in s:
-        if c in "[({":
-            depth += 1
-        elif c in "])}":
-            depth -= 1
-        if c == "," and depth == 0:
-            items.append(current.strip())
-            current = ""
-        else:
-            current += c
-    if current.strip():
-        items.append(current.strip())
-    return items
+# Parsed expressions kept by the interning cache (see parse_dsl).
+PARSE_CACHE_SIZE = 4096
 
 # -------------------------
-# DSL parser
+# DSL core
 # -------------------------
-def make_dsl(obj: Any) -> Union[Any, Callable[[], Any]]:
+def make_dsl(obj: Any) -> Union[Any, DSLNode]:
     """
     Convert a DSL string, number, or nested structure into:
       - a concrete value if fully validated with v:
-      - a callable producing the value at runtime otherwise
+      - a DSLNode producing the value at runtime otherwise
     """
     if isinstance(obj, (int, float)):
         return obj
     if isinstance(obj, str):
         return parse_dsl(obj)
-    if isinstance(obj, list):
-        choices = [make_dsl(x) for x in obj]
-        fn = lambda: call_if_zero_arg(random.choice(choices))
-        # attach domain
-        fn._domain = _compute_list_domain(choices)
-        return fn
+    if isinstance(obj, (list, tuple)):
+        frozen = _freeze(obj)
+        if frozen is None:
+            return _make_list(obj)
+        return _intern(("list", frozen), lambda: _make_list(obj))
     raise TypeError(f"Invalid DSL type: {type(obj)}")
 
+def _make_list(obj: list | tuple) -> Choice:
+    return Choice([as_node(make_dsl(x)) for x in obj], list(obj))
+
+def _freeze(obj: Any) -> Any:
+    """Hashable key for a JSON list of DSL items, or None if it can't be shared."""
+    items = []
+    for x in obj:
+        if isinstance(x, (list, tuple)):
+            x = _freeze(x)
+            if x is None:
+                return None
+        elif isinstance(x, str):
+            if "v:" in x:
+                return None
+            value = parse_dsl(x)
+            # expressions by canonical spelling, literals as written
+            x = value.source if isinstance(value, DSLNode) else x.strip()
+        elif not isinstance(x, (int, float)):
+            return None
+        items.append(x)
+    return tuple(items)
+
 # -------------------------
 # DSL parser
 # -------------------------
 BRACKET_PAIRS = {"(": ")", "[": "]", "{": "}"}
-
-def parse_dsl(s: str) -> Union[Any, Callable[[], Any]]:
+CLOSING = {v: k for k, v in BRACKET_PAIRS.items()}
+DSL_PREFIXES = ("r[", "r(", "r{", "l[", "l(", "l{", "wl[", "wl(", "wl{")
+
+class DSLSyntaxError(ValueError):
+    """Malformed DSL expression. `column` is 1-based, in the stripped expression."""
+    def __init__(self, message: str, source: str, pos: int):
+        self.source = source
+        self.column = pos + 1
+        super().__init__(f"{message} at column {self.column}: {source}")
+
+@profiled("dsl_parse")
+def parse_dsl(s: str) -> Union[Any, DSLNode]:
+    """
+    Parse a DSL string. Expressions are interned: equal expressions (up to
+    whitespace between items) share one node. "v:" expressions are sampled
+    while parsing, so they are never cached.
+    """
     s = s.strip()
-
-    # -------- validated "v:" --------
-    if s.startswith("v:"):
-        val = s[2:]
-        return call_if_zero_arg(parse_dsl(val))
-
-    # -------- range r[...] --------
-    if s.startswith(("r[", "r(", "r{")):
-        open_br = s[1]
-        close_br = BRACKET_PAIRS[open_br]
-        if not s.endswith(close_br):
-            raise ValueError(f"Range must end with '{close_br}': {s}")
-        inner = s[2:-1]
-        parts = parse_list_content(inner)
-        if len(parts) != 2:
-            raise ValueError(f"Range must have exactly 2 numbers or DSL expressions: {s}")
-        
-        min_val = make_dsl(parts[0])
-        max_val = make_dsl(parts[1])
-        min_vals = resolve_numeric_domain(min_val)
-        max_vals = resolve_numeric_domain(max_val)
-
-        # check all combinations
-        for a in min_vals:
-            for b in max_vals:
-                if a > b:
-                    raise ValueError(f"Range min {a} > max {b} in {s}")
-
-        def rng():
-            a = min_val() if callable(min_val) else min_val
-            b = max_val() if callable(max_val) else max_val
-            return random.uniform(a, b)
-
-        rng._domain = _compute_range_domain(min_val, max_val)
-        return rng
-
-    # -------- list l[...] --------
-    if s.startswith(("l[", "l(", "l{")):
-        open_br = s[1]
-        close_br = BRACKET_PAIRS[open_br]
-        if not s.endswith(close_br):
-            raise ValueError(f"List must end with '{close_br}': {s}")
-        inner = s[2:-1]
-        items = parse_list_content(inner)
-        if not items:
-            raise ValueError(f"List cannot be empty: {s}")
-        choices = [make_dsl(x) for x in items]
-
-        # check homogeneity
-        sample_cat = type_category(call_if_zero_arg(choices[0]))
-        for c in choices[1:]:
-            val = call_if_zero_arg(c)
-            if type_category(val) != sample_cat:
-                raise TypeError(f"List items must be homogeneous: {s}")
-
-        fn = lambda: call_if_zero_arg(random.choice(choices))
-        fn._domain = _compute_list_domain(choices)
-        return fn
-
-    # -------- weighted list wl[...] --------
-    if s.startswith(("wl[", "wl(", "wl{")):
-        open_br = s[2]
-        close_br = BRACKET_PAIRS[open_br]
-        if not s.endswith(close_br):
-            raise ValueError(f"Weighted list must end with '{close_br}': {s}")
-        inner = s[3:-1]
-        items = parse_list_content(inner)
-        if not items:
-            raise ValueError(f"Weighted list cannot be empty: {s}")
-
-        values, weights = [], []
-        for item in items:
-            item = item.strip()
-            if not (item.startswith("(") and item.endswith(")")):
-                raise ValueError(f"Weighted list item must be a 2-tuple: {item}")
-            val_str, weight_str = parse_list_content(item[1:-1])
-            values.append(make_dsl(val_str))
-            weights.append(float(weight_str))
-
-        # check homogeneity
-        sample_cat = type_category(call_if_zero_arg(values[0]))
-        for v in values[1:]:
-            val = call_if_zero_arg(v)
-            if type_category(val) != sample_cat:
-                raise TypeError(f"Weighted list items must be homogeneous: {s}")
-
-        fn = lambda: call_if_zero_arg(random.choices(values, weights=weights, k=1)[0])
-        fn._domain = _compute_list_domain(values)
-        return fn
-
-    return parse_number(s)
+    node = _lookup(s)
+    if node is not None:
+        return node
+    if "v:" in s or not s.startswith(DSL_PREFIXES):
+        return _parse(s)
+    return _intern(s, lambda: _parse(s))
+
+def _parse(s: str) -> Union[Any, DSLNode]:
+    if not s.startswith(DSL_PREFIXES) and not s.startswith("v:"):
+        return parse_number(s)
+    return _Parser(s).expr(0, len(s))[0]
+
+# The one cache of every DSL entry point. Nodes are kept by:
+#   - canonical spelling (items split and stripped), so sub-expressions are
+#     shared by every expression they appear in
+#   - the text given to parse_dsl, so parsing it again is one lookup
+#   - ("list", items) for the JSON lists given to make_dsl
+# Oldest entries are dropped past PARSE_CACHE_SIZE. Registries build systems
+# on several threads, so the cache is only read and written under _intern_lock
+# (nodes are built outside it: building interns the sub-expressions).
+_interned: dict[str | tuple, DSLNode] = {}
+_intern_lock = threading.Lock()
+
+def _lookup(key: str | tuple) -> DSLNode | None:
+    with _intern_lock:
+        return _interned.get(key)
+
+def _intern(key: str | tuple | None, build: Callable[[], DSLNode]) -> DSLNode:
+    if key is None:
+        return build()
+    node = _lookup(key)
+    if node is not None:
+        return node
+    node = build()
+    with _intern_lock:
+        # a thread that built the same expression meanwhile wins, keeping one node per key
+        node = _interned.setdefault(key, node)
+        while len(_interned) > PARSE_CACHE_SIZE:
+            _interned.pop(next(iter(_interned)), None)
+    return node
+
+def _pair_brackets(s: str) -> dict[int, int]:
+    """
+    Tokenize s in one pass: the position of the closing bracket of every
+    opening one (any bracket kind closes any other, as in the item splitter).
+    """
+    match, stack = {}, []
+    for pos, c in enumerate(s):
+        if c in BRACKET_PAIRS:
+            stack.append(pos)
+        elif c in CLOSING:
+            if not stack:
+                raise DSLSyntaxError(f"Unexpected '{c}'", s, pos)
+            match[stack.pop()] = pos
+    if stack:
+        raise DSLSyntaxError(f"Unclosed '{s[stack[-1]]}'", s, stack[-1])
+    return match
+
+class _Parser:
+    """
+    Recursive-descent parser over offsets into one expression string: items
+    are (start, end) spans, nested brackets are skipped through the pairing
+    table, so each character is looked at a bounded number of times.
+    """
+    def __init__(self, s: str):
+        self.s = s
+        self.match = _pair_brackets(s)
+
+    def error(self, message: str, pos: int):
+        raise DSLSyntaxError(message, self.s, pos)
+
+    def strip(self, i: int, j: int) -> tuple[int, int]:
+        s = self.s
+        while i < j and s[i].isspace():
+            i += 1
+        while j > i and s[j - 1].isspace():
+            j -= 1
+        return i, j
+
+    def items(self, i: int, j: int) -> list[tuple[int, int]]:
+        """Stripped spans of the top-level comma-separated items of s[i:j]."""
+        s, match, spans = self.s, self.match, []
+        start = pos = i
+        while pos < j:
+            c = s[pos]
+            if c in BRACKET_PAIRS:
+                pos = match[pos]
+            elif c == ",":
+                spans.append(self.strip(start, pos))
+                start = pos + 1
+            pos += 1
+        last = self.strip(start, j)
+        if last[0] < last[1]:
+            spans.append(last)
+        return spans
+
+    def expr(self, i: int, j: int) -> tuple[Any, str | None, Any]:
+        """
+        (value, canonical spelling, type category) of the item s[i:j]. Sampled
+        "v:" items have no spelling.
+        """
+        s = self.s
+        # -------- validated "v:" --------
+        if s.startswith("v:", i):
+            value = call_if_zero_arg(self.expr(*self.strip(i + 2, j))[0])
+            return value, None, type_category(value)
+
+        if s.startswith(("wl[", "wl(", "wl{"), i):
+            kind, head = "Weighted list", 3
+        elif s.startswith(("r[", "r(", "r{"), i):
+            kind, head = "Range", 2
+        elif s.startswith(("l[", "l(", "l{"), i):
+            kind, head = "List", 2
+        else:
+            text = s[i:j]
+            value = parse_number(text)
+            return value, text, type_category(value)
+
+        open_pos = i + head - 1
+        close_br = BRACKET_PAIRS[s[open_pos]]
+        close_pos = self.match[open_pos]
+        if s[close_pos] != close_br:
+            self.error(f"{kind} must end with '{close_br}'", close_pos)
+        if close_pos != j - 1:
+            self.error(f"Unexpected text after {kind.lower()}", close_pos + 1)
+        parts = self.items(open_pos + 1, close_pos)
+        prefix = s[i:open_pos + 1]
+
+        # -------- range r[...] --------
+        if kind == "Range":
+            if len(parts) != 2:
+                self.error("Range must have exactly 2 numbers or DSL expressions", open_pos)
+            (min_val, min_key, _), (max_val, max_key, _) = (self.expr(*p) for p in parts)
+            min_vals = resolve_numeric_domain(min_val)
+            max_vals = resolve_numeric_domain(max_val)
+
+            # check all combinations
+            for a in min_vals:
+                for b in max_vals:
+                    if a > b:
+                        self.error(f"Range min {a} > max {b}", i)
+
+            key = _join(prefix, (min_key, max_key), close_br)
+            return _intern(key, lambda: Range(as_node(min_val), as_node(max_val), key)), key, "number"
+
+        # -------- list l[...] --------
+        if kind == "List":
+            if not parts:
+                self.error("List cannot be empty", open_pos)
+            parsed = [self.expr(*p) for p in parts]
+            choices = [value for value, _, _ in parsed]
+            category = self.check_homogeneous(kind, [c for _, _, c in parsed], parts)
+            key = _join(prefix, [k for _, k, _ in parsed], close_br)
+            return _intern(key, lambda: Choice([as_node(c) for c in choices], key)), key, category
+
+        # -------- weighted list wl[...] --------
+        if not parts:
+            self.error("Weighted list cannot be empty", open_pos)
+        values, weights, keys, categories = [], [], [], []
+        for a, b in parts:
+            if s[a] != "(" or self.match[a] != b - 1:
+                self.error("Weighted list item must be a 2-tuple", a)
+            pair = self.items(a + 1, b - 1)
+            if len(pair) != 2:
+                self.error("Weighted list item must be a 2-tuple", a)
+            value, value_key, category = self.expr(*pair[0])
+            weight = s[pair[1][0]:pair[1][1]]
+            try:
+                weights.append(float(weight))
+            except ValueError:
+                self.error(f"Invalid weight '{weight}'", pair[1][0])
+            values.append(value)
+            categories.append(category)
+            keys.append(None if value_key is None else f"({value_key},{weight})")
+        category = self.check_homogeneous(kind, categories, parts)
+        key = _join(prefix, keys, close_br)
+        return _intern(key, lambda: WeightedChoice([as_node(v) for v in values], weights, key)), key, category
+
+    def check_homogeneous(self, kind: str, categories: list, spans: list[tuple[int, int]]) -> Any:
+        """The items' common type category (a range counts as a number)."""
+        for category, (a, _) in zip(categories[1:], spans[1:]):
+            if category != categories[0]:
+                raise TypeError(f"{kind} items must be homogeneous (column {a + 1}): {self.s}")
+        return categories[0]
+
+def _join(prefix: str, keys, close_br: str) -> str | None:
+    keys = list(keys)
+    if any(k is None for k in keys):
+        return None
+    return prefix + ",".join(keys) + close_br
+
+def as_node(val: Any) -> DSLNode:
+    """Items of composite expressions are all nodes, literals included."""
+    return val if isinstance(val, DSLNode) else Const(val)
 
 def type_category(v):
     if isinstance(v, (int, float)):
@@ -174,6 +299,49 @@ def parse_number(s: str):
             pass
     return s  # fallback string
 
+# -------------------------
+# Batch sampling
+# -------------------------
+def sample_n(expr: Any, n: int, rng: Any = None):
+    """
+    n draws of a DSL value as a numpy array, vectorised over the whole
+    expression tree (Monte Carlo balance studies). Needs numpy, an optional
+    dependency (requirements-analysis.txt).
+    rng: a numpy Generator, or a seed / None for a new one.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("sample_n needs numpy (pip install -r requirements-analysis.txt)") from None
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    if isinstance(expr, DSLNode):
+        return expr.sample_n(rng, n)
+    if callable(expr):
+        return np.array([expr() for _ in range(n)])
+    return np.full(n, expr)
+
+# -------------------------
+# Distributions
+# -------------------------
+def distribution(expr: Any) -> Distribution:
+    """
+    Closed-form distribution of a DSL value: mean, variance, min/max and,
+    for discrete values, the PMF. Cheaper than sampling when only
+    expectations are needed (AI scoring, damage previews).
+        distribution(parse_dsl("l[1, r[2,4]]")).mean  # 2.0
+    """
+    if isinstance(expr, DSLNode):
+        return _node_distribution(expr)
+    if callable(expr):
+        raise ValueError("Callable has no distribution metadata")
+    return Distribution.point(expr)
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _node_distribution(node: DSLNode) -> Distribution:
+    # nodes are immutable and interned, so their distribution can be shared
+    return node.distribution()
+
 # -------------------------
 # DSL domain helper
 # -------------------------
@@ -184,60 +352,25 @@ def get_domain(obj):
       - iterable of possible values
       - or a single-value set for constants
     """
-    if callable(obj):
+    if isinstance(obj, DSLNode):
+        dom = obj.domain
+    elif callable(obj):
         dom = getattr(obj, "_domain", None)
-        if dom is None:
-            raise ValueError("Callable has no domain metadata")
-        return dom
-
-    # If hashable, wrap in a set
-    try:
-        hash(obj)
-        return {obj}
-    except TypeError:
-        # Unhashable objects (like lists) -> return as a single-item list
-        return [obj]
-# -------------------------
-def _compute_list_domain(choices):
-    """Compute symbolic domain for a list of DSL callables or values."""
-    dom = set()
-    ranges = []
-    for c in choices:
-        if callable(c):
-            d = getattr(c, "_domain", None)
-            if isinstance(d, tuple) and all(isinstance(x, (int, float)) for x in d):
-                # symbolic range
-                ranges.append(d)
-            elif isinstance(d, set):
-                dom.update(d)
-        else:
-            dom.add(c)
-    return dom.union({r for r in ranges})
-
-def _compute_range_domain(min_val, max_val):
-    # Resolve min
-    if callable(min_val):
-        dom = getattr(min_val, "_domain", None)
-        if isinstance(dom, set):
-            min_val = min(dom)
-        elif isinstance(dom, tuple):
-            min_val = dom[0]
-        else:
-            raise TypeError("Invalid domain for range min")
-    # Resolve max
-    if callable(max_val):
-        dom = getattr(max_val, "_domain", None)
-        if isinstance(dom, set):
-            max_val = max(dom)
-        elif isinstance(dom, tuple):
-            max_val = dom[1]
-        else:
-            raise TypeError("Invalid domain for range max")
-    return (min_val, max_val)
+    else:
+        # If hashable, wrap in a set
+        try:
+            hash(obj)
+            return {obj}
+        except TypeError:
+            # Unhashable objects (like lists) -> return as a single-item list
+            return [obj]
+    if dom is None:
+        raise ValueError("Callable has no domain metadata")
+    return dom
 
 def resolve_numeric_domain(val):
     if callable(val):
-        dom = getattr(val, "_domain", None)
+        dom = val.domain if isinstance(val, DSLNode) else getattr(val, "_domain", None)
         if dom is None:
             # fallback: evaluate once and wrap in list
             return [val()]
@@ -256,6 +389,7 @@ def resolve_numeric_domain(val):
 # -------------------------
 # Comparison helpers
 # -------------------------
+@profiled("check")
 def check(expr: str, **vars):
     """
     Check that expr holds for all possible values of the given variables.
@@ -266,7 +400,26 @@ def check(expr: str, **vars):
     Example:
         check("0 <= x <= y", x=r[1,5], y=10)
     """
-    # Build the domain for each variable
+    # Decide symbolically over intervals / finite sets; what can't be decided
+    # that way is checked at every combination of values / range endpoints.
+    # Both go through the compiled predicate: expressions are never eval'd.
+    try:
+        env = {name: Dom.of(val) for name, val in vars.items()}
+    except ValueError:
+        env = None
+    verdict = holds(expr, env) if env is not None else None
+    if verdict is True:
+        return
+    if verdict is False:
+        raise ValueError(f"Check failed for values {env}: {expr}")
+    _check_combinations(expr, vars)
+
+def _check_combinations(expr: str, vars: dict):
+    """Check expr at every combination of values / range endpoints."""
+    try:
+        predicate = compile_check(expr)
+    except Unsupported:
+        raise ValueError(f"Unsupported check expression: {expr}") from None
     domains = {}
     for name, val in vars.items():
         dom = get_domain(val)
@@ -281,14 +434,14 @@ def check(expr: str, **vars):
                     norm.append(d)
         domains[name] = norm
 
-    # Test all combinations
     for combination in product(*domains.values()):
         local = dict(zip(domains.keys(), combination))
         try:
-            if not eval(expr, {}, local):
-                raise ValueError(f"Check failed for values {local}: {expr}")
+            ok = predicate({name: Dom((value,)) for name, value in local.items()})
         except Exception as e:
             raise ValueError(f"Check evaluation error for values {local}: {e}")
+        if not ok:
+            raise ValueError(f"Check failed for values {local}: {expr}")
 
 # -------------------------
 # Base types
@@ -318,17 +471,12 @@ class RandomInt(RandomNumber):
     def validate(cls, v, info=None):
         val = super().validate(v)
 
+        if isinstance(val, Rounded):
+            return val
+        if isinstance(val, DSLNode):
+            return _rounded(val)
         if callable(val):
-            def _wrapped():
-                return int(round(call_if_zero_arg(val)))
-            # Preserve domain if present (rounded to ints when possible)
-            dom = getattr(val, "_domain", None)
-            if dom is not None:
-                try:
-                    _wrapped._domain = {int(round(x)) for x in dom} if isinstance(dom, set) else dom
-                except Exception:
-                    pass
-            return _wrapped
+            return Rounded(val)
 
         if isinstance(val, float):
             return int(round(val))
@@ -370,6 +518,9 @@ class RandomBool:
             return val
         raise TypeError(f"RandomBool must be a bool or DSL string, got {type(v)}")
 
+# Interned like the nodes they wrap.
+_rounded = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(Rounded)
+
 # -------------------------
 # Aliases
 # -------------------------
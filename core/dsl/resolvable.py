@@ -1,16 +1,134 @@
+import collections.abc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+import inspect
+import types
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
 from pydantic import BaseModel
+from core.dsl.nodes import DSLNode
+from core.rng import current_rng
 from core.utils.callables import call_if_zero_arg
 
 class ResolvableModel(BaseModel):
-    def __getattribute__(self, name: str):
-        value = super().__getattribute__(name)
+    """
+    Model whose DSL-typed fields resolve on read: a field holding a DSL node
+    (or another zero-arg callable) returns a fresh sample each access.
+
+    Which fields can hold one is decided once per class from the annotations;
+    only those get a resolving descriptor; other fields are plain attributes.
+    Within resolution_snapshot(), repeated reads return the first sample.
+    """
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        for name, field in cls.__pydantic_fields__.items():
+            if may_hold_callable(field.annotation) and not isinstance(inspect.getattr_static(cls, name, None), _Resolved):
+                setattr(cls, name, _Resolved(name))
+
+    @classmethod
+    def trusted(cls, **values):
+        """
+        Build an instance without validation, for objects the engine makes at
+        runtime from content that was already validated at load.
+        """
+        return cls.model_construct(**values)
+
+class _Resolved:
+    """Data descriptor of a DSL-typed field: reads sample the stored value."""
+    __slots__ = ("name",)
 
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            # pydantic keeps no class attribute for fields
+            raise AttributeError(self.name)
         try:
-            fields = super().__getattribute__("model_fields")
-        except Exception:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if not (isinstance(value, DSLNode) or callable(value)):
             return value
+        snapshot = _snapshot.get()
+        if snapshot is None:
+            return _resolve(value)
+        key = (id(obj), self.name)
+        entry = snapshot.get(key)
+        if entry is None or entry[1] is not value:
+            # the model is kept in the entry so its id can't be reused meanwhile
+            entry = snapshot[key] = (obj, value, _resolve(value))
+        return entry[2]
 
-        if name not in fields:
-            return value
+    def __set__(self, obj, value):
+        # pydantic's __setattr__ writes __dict__ itself; this only makes the
+        # descriptor take precedence over the instance dict on reads
+        obj.__dict__[self.name] = value
+
+def _resolve(value):
+    if isinstance(value, DSLNode):
+        return value.sample(current_rng())
+    return call_if_zero_arg(value)
+
+# -------------------------
+# Resolution snapshots
+# -------------------------
+_snapshot: ContextVar[dict | None] = ContextVar("resolution_snapshot", default=None)
+
+@contextmanager
+def resolution_snapshot(snapshot: dict | None = None):
+    """
+    Freeze DSL field reads within the block: the first read of a field of a
+    model samples it, later reads of that field return the same value (until
+    the field is assigned). Pass the same dict again to extend a snapshot
+    over several blocks, e.g. a whole turn.
+    """
+    token = _snapshot.set({} if snapshot is None else snapshot)
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+_per_action: ContextVar[bool] = ContextVar("resolution_per_action", default=False)
+
+@contextmanager
+def per_action_resolution():
+    """
+    Within the block, DSL fields resolve once per executed action: the move
+    engine wraps each action it runs in action_snapshot().
+    """
+    token = _per_action.set(True)
+    try:
+        yield
+    finally:
+        _per_action.reset(token)
+
+def action_snapshot():
+    """A fresh snapshot for one executed action under per_action_resolution(), else a no-op."""
+    return resolution_snapshot() if _per_action.get() else nullcontext()
+
+# -------------------------
+# Field classification
+# -------------------------
+_UNIONS = (Union, types.UnionType)
 
-        return call_if_zero_arg(value)
+def may_hold_callable(tp: Any) -> bool:
+    """Whether a field annotated `tp` can hold a zero-arg callable (e.g. RNUM, RSTR)."""
+    if tp is Any or tp is object:
+        return True
+    origin = get_origin(tp)
+    if origin is None:
+        if isinstance(tp, type):
+            return any("__call__" in vars(k) for k in tp.__mro__ if k is not object)
+        return True  # unresolved forward reference, TypeVar...: can't tell
+    if origin is Annotated:
+        return may_hold_callable(get_args(tp)[0])
+    if origin in _UNIONS:
+        return any(may_hold_callable(arg) for arg in get_args(tp))
+    if origin is Literal:
+        return False
+    if origin is collections.abc.Callable:
+        return True
+    # parametrised generic: its instances are of the origin class (list, dict...)
+    return may_hold_callable(origin)
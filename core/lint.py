@@ -0,0 +1,207 @@
+"""
+Content-pack linter.
+
+    python -m core.lint data/ [--systems moves fighters] [--workers N]
+
+Validates every entry of the list systems on its own (in parallel for big
+packs), so one bad entry doesn't hide the others, then checks references
+between systems (fighter -> moves) in a single pass over an id index.
+Errors are printed with their JSON path; the exit status is 1 if any.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Any, Iterator, Type
+import warnings
+
+from pydantic import BaseModel, RootModel, ValidationError
+
+from core.registry import MIN_SHARD_SIZE, MIN_PARALLEL_ENTRIES, SystemSpec, list_item_type, registry
+from core.shards import data_files, is_sharded
+
+DEFAULT_SYSTEMS = ("moves", "fighters")
+
+
+class _AnyId:
+    """Stands in for another system's ids while validating: references are checked afterwards."""
+    def __contains__(self, item: Any) -> bool:
+        return True
+
+class LintError:
+    __slots__ = ("path", "message")
+
+    def __init__(self, path: str, message: str):
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+def json_path(base: str, loc: tuple) -> str:
+    return base + "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in loc)
+
+# -------------------------
+# Reading
+# -------------------------
+def _entries(path: Path, root: Path) -> Iterator[tuple[str, Any] | LintError]:
+    """(JSON path, entry) for every entry of a data source; unreadable files yield a LintError."""
+    for file in data_files(path):
+        name = file.relative_to(root).as_posix()
+        if file.suffix == ".jsonl":
+            with file.open("rb") as f:
+                for lineno, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield f"{name}:{lineno}", json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield LintError(f"{name}:{lineno}", f"invalid JSON: {e.msg} (column {e.colno})")
+            continue
+        try:
+            raw = json.loads(file.read_bytes())
+        except json.JSONDecodeError as e:
+            yield LintError(name, f"invalid JSON: {e.msg} (line {e.lineno}, column {e.colno})")
+            continue
+        if not isinstance(raw, list):
+            if is_sharded(path):
+                raw = [raw]
+            else:
+                yield LintError(name, "expected a JSON array of entries")
+                continue
+        for i, entry in enumerate(raw):
+            yield f"{name}[{i}]", entry
+
+# -------------------------
+# Validation
+# -------------------------
+def _lint_chunk(item_type: Type[BaseModel], entries: list, context: dict) -> list:
+    """
+    Validate entries one by one. Returns, per entry, either the error list
+    [(loc, msg)] or (id, enabled, references) of the validated entry.
+    """
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for entry in entries:
+            try:
+                item = item_type.model_validate(entry, context=context)
+            except ValidationError as e:
+                results.append([(tuple(err["loc"]), err["msg"]) for err in e.errors(include_url=False)])
+                continue
+            except Exception as e:
+                results.append([((), str(e))])
+                continue
+            refs = item.references() if hasattr(item, "references") else {}
+            results.append((getattr(item, "id", None), getattr(item, "enabled", True), refs))
+    return results
+
+class Linter:
+    def __init__(self, data_root: Path, systems: tuple[str, ...] = DEFAULT_SYSTEMS, workers: int | None = None):
+        self.data_root = Path(data_root)
+        self.registry = registry.derive(self.data_root, snapshot_dir=None, validation_workers=0)
+        self.systems = self.registry.build_order(systems)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.errors: list[LintError] = []
+        self.entries = 0
+        # system -> id -> JSON path, for validated (enabled) entries
+        self.index: dict[str, dict[str, str]] = {}
+        self.declared: dict[str, set[str]] = {}
+        self._refs: list[tuple[str, dict[str, list[str]]]] = []
+
+    def run(self) -> list[LintError]:
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for name in self.systems:
+                self._lint_system(self.registry.spec(name), pool)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self._check_references()
+        return self.errors
+
+    def _lint_system(self, spec: SystemSpec, pool: ProcessPoolExecutor | None):
+        path = self.data_root / spec.data_file
+        if not path.exists():
+            self.errors.append(LintError(spec.data_file, f"data for system '{spec.name}' not found"))
+            return
+
+        if not issubclass(spec.schema, RootModel):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    spec.schema.model_validate(json.loads(path.read_bytes()))
+            except json.JSONDecodeError as e:
+                self.errors.append(LintError(spec.data_file, f"invalid JSON: {e.msg} (line {e.lineno}, column {e.colno})"))
+            except ValidationError as e:
+                self.errors.extend(LintError(json_path(spec.data_file, tuple(err["loc"])), err["msg"]) for err in e.errors(include_url=False))
+            return
+
+        paths, entries = [], []
+        for item in _entries(path, self.data_root):
+            if isinstance(item, LintError):
+                self.errors.append(item)
+            else:
+                paths.append(item[0])
+                entries.append(item[1])
+        self.entries += len(entries)
+
+        item_type = list_item_type(spec.schema)
+        context = {"configs": {name: _AnyId() for name in self.systems}}
+        if pool is not None and len(entries) >= MIN_PARALLEL_ENTRIES:
+            size = max(MIN_SHARD_SIZE, math.ceil(len(entries) / (self.workers * 4)))
+            futures = [pool.submit(_lint_chunk, item_type, entries[i:i + size], context) for i in range(0, len(entries), size)]
+            results = [result for future in futures for result in future.result()]
+        else:
+            results = _lint_chunk(item_type, entries, context)
+
+        index = self.index[spec.name] = {}
+        declared = self.declared[spec.name] = set()
+        for base, entry, result in zip(paths, entries, results):
+            if isinstance(entry, dict) and "id" in entry:
+                declared.add(entry["id"])
+            if isinstance(result, list):
+                self.errors.extend(LintError(json_path(base, loc), msg) for loc, msg in result)
+                continue
+            id, enabled, refs = result
+            if not enabled:
+                continue
+            if id in index:
+                self.errors.append(LintError(base, f"duplicate {spec.name} id '{id}' (first at {index[id]})"))
+            index[id] = base
+            if refs:
+                self._refs.append((base, refs))
+
+    def _check_references(self):
+        for base, refs in self._refs:
+            for system, ids in refs.items():
+                valid = self.index.get(system, {})
+                for i, id in enumerate(ids):
+                    if id in valid:
+                        continue
+                    problem = "invalid or disabled" if id in self.declared.get(system, ()) else "unknown"
+                    self.errors.append(LintError(f"{base}.{system}[{i}]", f"references {problem} {system} id '{id}'"))
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.lint", description="Validate a content pack.")
+    parser.add_argument("data_root", type=Path, help="data directory (e.g. data/)")
+    parser.add_argument("--systems", nargs="+", default=list(DEFAULT_SYSTEMS), help="systems to lint (their dependencies are linted too)")
+    parser.add_argument("--workers", type=int, default=None, help="validation processes (default: CPU count, 1 = in-process)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    linter = Linter(args.data_root, tuple(args.systems), args.workers)
+    errors = linter.run()
+    for error in errors:
+        print(error)
+    elapsed = time.perf_counter() - start
+    print(f"{len(errors)} error(s) in {linter.entries} entries of {', '.join(linter.systems)} ({elapsed:.2f}s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
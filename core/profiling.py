@@ -0,0 +1,227 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+from pathlib import Path
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+
+class PhaseStats:
+    __slots__ = ("wall", "self_time", "calls", "blocks")
+
+    def __init__(self):
+        self.wall = 0.0       # inclusive wall time
+        self.self_time = 0.0  # wall time minus nested phases
+        self.calls = 0
+        self.blocks = 0       # net allocated memory blocks (sys.getallocatedblocks)
+
+    def as_dict(self) -> dict:
+        return {
+            "wall": self.wall,
+            "self": self.self_time,
+            "calls": self.calls,
+            "blocks": self.blocks,
+        }
+
+class _Frame:
+    __slots__ = ("system", "phase", "child_time")
+
+    def __init__(self, system: str, phase: str):
+        self.system = system
+        self.phase = phase
+        self.child_time = 0.0
+
+class StartupProfile:
+    """
+    Per-system, per-phase timings of a registry build.
+
+    Phases nest: e.g. `dsl_parse` and `check` run inside `validate`, and a
+    system built while validating another (fighters -> moves) is recorded
+    under its own name. `wall` is inclusive, `self` excludes nested phases.
+    """
+    def __init__(self):
+        self.stats: dict[str, dict[str, PhaseStats]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self) -> list[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @property
+    def system(self) -> str | None:
+        return self._stack[-1].system if self._stack else None
+
+    @contextmanager
+    def phase(self, phase: str, system: str | None = None):
+        system = system or self.system or "-"
+        frame = _Frame(system, phase)
+        stack = self._stack
+        stack.append(frame)
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        token = _active.set(self)
+        try:
+            yield
+        finally:
+            _active.reset(token)
+            elapsed = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks
+            stack.pop()
+            if stack:
+                stack[-1].child_time += elapsed
+            with self._lock:
+                stats = self.stats.setdefault(system, {}).setdefault(phase, PhaseStats())
+                stats.wall += elapsed
+                stats.self_time += elapsed - frame.child_time
+                stats.calls += 1
+                stats.blocks += blocks
+
+    def call(self, phase: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """
+        Time one call of a hot function (see `profiled`) as a leaf phase:
+        only wall time and call count, since block counting walks the heap.
+        """
+        hot = getattr(self._local, "hot", None)
+        if hot is None:
+            hot = self._local.hot = set()
+        if phase in hot:
+            return fn(*args, **kwargs)
+        outermost = not hot
+        hot.add(phase)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            hot.discard(phase)
+            stack = self._stack
+            system = stack[-1].system if stack else "-"
+            if stack and outermost:
+                stack[-1].child_time += elapsed
+            with self._lock:
+                stats = self.stats.setdefault(system, {}).setdefault(phase, PhaseStats())
+                stats.wall += elapsed
+                stats.self_time += elapsed
+                stats.calls += 1
+
+    def report(self) -> dict:
+        return {
+            "systems": {
+                system: {phase: s.as_dict() for phase, s in phases.items()}
+                for system, phases in self.stats.items()
+            },
+        }
+
+    def dump(self, path: str | Path):
+        with Path(path).open("w") as f:
+            json.dump(self.report(), f, indent=2)
+
+# Profile of the registry build currently running in this context, if any.
+_active: ContextVar[StartupProfile | None] = ContextVar("startup_profile", default=None)
+
+def profiled(phase: str) -> Callable:
+    """
+    Record calls to the decorated function as `phase` while a registry build
+    is being profiled. Recursive calls are only counted once.
+    """
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any):
+            profile = _active.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            return profile.call(phase, fn, args, kwargs)
+        return wrapper
+    return deco
+
+
+# -------------------------
+# Execution profiles
+# -------------------------
+class CallStats:
+    """
+    Count, successes and wall time of one kind of call. The p99 is taken from
+    a uniform reservoir sample of the call times, so memory stays bounded.
+    """
+    __slots__ = ("calls", "successes", "total", "max", "sample")
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.sample: list[float] = []
+
+    def add(self, elapsed: float, success: bool, rng: random.Random, size: int):
+        self.calls += 1
+        self.successes += success
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if len(self.sample) < size:
+            self.sample.append(elapsed)
+        else:
+            # reservoir sampling: keep each call with probability size / calls
+            slot = rng.randrange(self.calls)
+            if slot < size:
+                self.sample[slot] = elapsed
+
+    def percentile(self, q: float) -> float:
+        if not self.sample:
+            return 0.0
+        ordered = sorted(self.sample)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else 0.0,
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "success_rate": self.successes / self.calls if self.calls else 0.0,
+        }
+
+class ExecutionProfile:
+    """
+    Call statistics of a running engine, grouped in tables keyed by id
+    (e.g. "moves" by move id, "actions" by action id). Callers record into
+    it themselves; with `dump_path` set, the report is written again every
+    `dump_every` seconds of recording (checked as calls are recorded).
+    """
+    SAMPLE_SIZE = 1024
+
+    def __init__(self, dump_path: str | Path | None = None, dump_every: float = 60.0):
+        self.tables: dict[str, dict[str, CallStats]] = {}
+        self.dump_path = dump_path
+        self.dump_every = dump_every
+        self._next_dump = time.perf_counter() + dump_every
+        self._rng = random.Random(0)  # reservoir slots; never a game stream
+
+    def stats(self, table: str, key: str) -> CallStats:
+        return self.tables.setdefault(table, {}).setdefault(key, CallStats())
+
+    def record(self, stats: CallStats, elapsed: float, success: bool, now: float):
+        """Add one call to `stats`, finished at perf_counter() time `now`."""
+        stats.add(elapsed, success, self._rng, self.SAMPLE_SIZE)
+        if self.dump_path is not None and now >= self._next_dump:
+            self._next_dump = now + self.dump_every
+            self.dump(self.dump_path)
+
+    def snapshot(self) -> dict:
+        return {
+            table: {key: s.as_dict() for key, s in entries.items()}
+            for table, entries in self.tables.items()
+        }
+
+    def dump(self, path: str | Path):
+        with Path(path).open("w") as f:
+            json.dump(self.snapshot(), f, indent=2)
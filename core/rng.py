@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
+import random
+from typing import Any
+
+
+# -------------------------
+# Random streams
+# -------------------------
+# Each battle owns a random.Random. Code that is handed the battle uses it
+# directly; DSL values read while a battle runs (ResolvableModel fields)
+# sample from the stream bound here, falling back to the global generator.
+_rng: ContextVar[Any] = ContextVar("dsl_rng", default=random)
+
+def current_rng() -> Any:
+    """The generator bound in this context, else the `random` module."""
+    return _rng.get()
+
+@contextmanager
+def use_rng(rng: Any):
+    """Bind `rng` (a random.Random) for DSL sampling within the block."""
+    token = _rng.set(rng)
+    try:
+        yield rng
+    finally:
+        _rng.reset(token)
+
+def derive_seed(master: int, *keys: Any) -> int:
+    """
+    Seed of an independent stream derived from a master seed, e.g.
+    derive_seed(sweep_seed, i) for battle i of a sweep. Stable across
+    processes and Python versions.
+    """
+    h = hashlib.sha256(repr((master, *keys)).encode()).digest()
+    return int.from_bytes(h[:8], "big")
+
+def new_seed() -> int:
+    """A fresh 64-bit seed, drawn from the global generator (so random.seed() still pins it)."""
+    return random.getrandbits(64)
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+from core.snapshot import digest
+
+# Lines of a JSON-lines file validated (and cached) together.
+JSONL_SHARD_LINES = 256
+
+DATA_SUFFIXES = (".json", ".jsonl")
+
+
+# -------------------------
+# Data sources
+# -------------------------
+# A system's data_file is either a single JSON document, a JSON-lines file
+# (one entry per line) or a directory of such files. The last two are read
+# shard by shard so large content packs never sit in memory all at once.
+def is_sharded(path: Path) -> bool:
+    return path.is_dir() or path.suffix == ".jsonl"
+
+def data_files(path: Path) -> list[Path]:
+    """The files backing a data path, in load order."""
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.suffix in DATA_SUFFIXES and p.is_file())
+    return [path] if path.exists() else []
+
+def iter_shards(path: Path) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield (shard name, raw bytes) for a sharded data path: one shard per
+    .json file, one per JSONL_SHARD_LINES lines of a .jsonl file.
+    """
+    root = path if path.is_dir() else path.parent
+    for file in data_files(path):
+        name = file.relative_to(root).as_posix()
+        if file.suffix != ".jsonl":
+            yield name, file.read_bytes()
+            continue
+        with file.open("rb") as f:
+            block, first = [], 1
+            for lineno, line in enumerate(f, 1):
+                block.append(line)
+                if len(block) == JSONL_SHARD_LINES:
+                    yield f"{name}:{first}", b"".join(block)
+                    block, first = [], lineno + 1
+            if block:
+                yield f"{name}:{first}", b"".join(block)
+
+def parse_shard(name: str, data: bytes) -> list[Any]:
+    """Entries of a shard produced by iter_shards."""
+    if ".jsonl:" in name:
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+    raw = json.loads(data)
+    return raw if isinstance(raw, list) else [raw]
+
+def source_mtime(path: Path) -> int:
+    """Latest modification time of a data path (a directory counts itself, for deleted shards)."""
+    mtimes = [f.stat().st_mtime_ns for f in data_files(path)]
+    if path.is_dir():
+        mtimes.append(path.stat().st_mtime_ns)
+    elif not mtimes:
+        raise FileNotFoundError(path)
+    return max(mtimes)
+
+def source_digest(path: Path) -> str:
+    """Content digest of a data path, over every file it is read from."""
+    if not path.is_dir():
+        return digest(path.read_bytes())
+    files = [(f.relative_to(path).as_posix(), digest(f.read_bytes())) for f in data_files(path)]
+    return digest(json.dumps(files).encode())
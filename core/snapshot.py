@@ -0,0 +1,126 @@
+import hashlib
+import hmac
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any
+
+import pydantic
+
+# Bump when the on-disk layout of snapshots changes.
+SNAPSHOT_FORMAT = 3
+
+
+# -------------------------
+# Pickling
+# -------------------------
+# DSL values are slotted nodes (core.dsl.nodes) and pickle by value; nodes
+# shared between entries are stored once per pickle and stay shared on load.
+def dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+def loads(data: bytes) -> Any:
+    return pickle.loads(data)
+
+# -------------------------
+# Snapshot store
+# -------------------------
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def snapshot_key(*parts: Any) -> str:
+    """Key of a snapshot: the given parts plus everything the pickle depends on."""
+    h = hashlib.sha256()
+    for part in (SNAPSHOT_FORMAT, sys.version_info[:2], pydantic.VERSION, *parts):
+        h.update(repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+# -------------------------
+# Snapshot location
+# -------------------------
+# Snapshots are pickles, so they never live inside a data root: a content
+# pack could ship one. They go to a per-user cache directory instead.
+def cache_root() -> Path:
+    """Per-user directory holding the snapshots of every data root (BRANLY_SNAPSHOT_DIR overrides it)."""
+    if os.environ.get("BRANLY_SNAPSHOT_DIR"):
+        return Path(os.environ["BRANLY_SNAPSHOT_DIR"])
+    if os.name == "nt":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "branly" / "snapshots"
+
+def snapshot_dir(data_root: Path) -> Path:
+    """Snapshot directory of a data root, in the per-user cache."""
+    return cache_root() / digest(str(Path(data_root).resolve()).encode())[:16]
+
+# -------------------------
+# Snapshot store
+# -------------------------
+MAGIC = b"BRANLY-SNAPSHOT\n"
+
+class SnapshotStore:
+    """
+    One file per system in `root`: a plain-text header holding the key it
+    was written for and an HMAC of key and payload, then the pickled
+    validated config. The header is checked before anything is unpickled,
+    with a per-store secret only this user can read.
+    """
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, name: str) -> Path:
+        return self.root / f"{name}.snapshot"
+
+    def _secret(self, create: bool) -> bytes | None:
+        path = self.root / "secret"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            if not create:
+                return None
+        secret = os.urandom(32)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return path.read_bytes()  # written by a concurrent process
+        with os.fdopen(fd, "wb") as f:
+            f.write(secret)
+        return secret
+
+    @staticmethod
+    def _mac(secret: bytes, key: str, payload: bytes) -> str:
+        return hmac.new(secret, key.encode() + b"\0" + payload, hashlib.sha256).hexdigest()
+
+    def load(self, name: str, key: str) -> Any | None:
+        try:
+            secret = self._secret(create=False)
+            if secret is None:
+                return None
+            data = self._path(name).read_bytes()
+            if not data.startswith(MAGIC):
+                return None
+            stored_key, mac, payload = data[len(MAGIC):].split(b"\n", 2)
+            if stored_key.decode() != key:
+                return None
+            if not hmac.compare_digest(mac.decode(), self._mac(secret, key, payload)):
+                return None  # not written by this user: never unpickled
+            return loads(payload)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible snapshot: treat as a miss, it will be rewritten.
+            return None
+
+    def store(self, name: str, key: str, config: Any):
+        payload = dumps(config)
+        self.root.mkdir(parents=True, exist_ok=True, mode=0o700)
+        mac = self._mac(self._secret(create=True), key, payload)
+        path = self._path(name)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            f.write(MAGIC + f"{key}\n{mac}\n".encode())
+            f.write(payload)
+        os.replace(tmp, path)
@@ -1,11 +1,15 @@
 import inspect
 from typing import Any
 
+from core.dsl.nodes import DSLNode
+from core.rng import current_rng
 
 def is_zero_arg_callable(value: Any) -> bool:
     """
     Return True if `value` is callable and can be called with no arguments.
     """
+    if isinstance(value, DSLNode):
+        return True
     if not callable(value):
         return False
 
@@ -31,4 +35,6 @@ def call_if_zero_arg(value: Any):
     """
     Call value if it is a zero-arg callable, otherwise return as-is.
     """
+    if isinstance(value, DSLNode):
+        return value.sample(current_rng())
     return value() if is_zero_arg_callable(value) else value
\ No newline at end of file
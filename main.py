@@ -1,17 +1,14 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from systems.battle.schema import FighterVolatile
+
 import random
-from time import sleep
 from core.registry import registry
-from systems.battle.engine import BattleMode
-from systems.battle.schema import Battle, FighterVolatile
-from systems.display.engine import DisplayEngine
 
-import systems.moves
-import systems.fighters
-import systems.battle
-import systems.display
-import systems.audio
+# Systems are imported lazily by the registry on first use.
 
-# Optional: deterministic runs for debugging
+# Optional: deterministic runs for debugging (battles draw their seed from it)
 random.seed(0)
 
 def coerce_seq(val):
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('assets', 'assets'), ('data', 'data')],
-    hiddenimports=['pygame._sdl2', 'pygame_gui.core'],
+    hiddenimports=['pygame._sdl2', 'pygame_gui.core', 'systems.types', 'systems.moves', 'systems.fighters', 'systems.battle', 'systems.audio', 'systems.display'],  # systems are imported lazily by the registry
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
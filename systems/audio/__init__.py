@@ -4,9 +4,10 @@ from .engine import create_engine as create_audio
 
 DATA_FILE = "audio.json"
 
-registry.add_spec(SystemSpec(
+SPEC = SystemSpec(
     name="audio",
     schema=AudioConfig,
     engine_factory=create_audio,
     data_file=DATA_FILE
-))
+)
+registry.add_spec(SPEC)
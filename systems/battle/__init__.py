@@ -4,9 +4,12 @@ from .engine import create_engine as create_battle
 
 DATA_FILE = "battle.json"
 
-registry.add_spec(SystemSpec(
+SPEC = SystemSpec(
     name="battle",
     schema=BattleConfig,
     engine_factory=create_battle,
-    data_file=DATA_FILE
-))
\ No newline at end of file
+    data_file=DATA_FILE,
+    schema_version=3,  # 2: BattleConfig.resolution, 3: BattleConfig.verbosity
+    depends_on=("types", "moves", "fighters"),
+)
+registry.add_spec(SPEC)
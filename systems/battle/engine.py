@@ -5,14 +5,16 @@ if TYPE_CHECKING:
     from .schema import Battle, BattleConfig, FighterVolatile
     from typing import Callable
     from core.registry import SystemRegistry
+    from ..moves.engine import MoveEngine
 
+from contextlib import nullcontext
 import inspect
-import random
 import warnings
 from enum import Enum
 
-# to load moves system
-from .. import moves
+from core.dsl.resolvable import per_action_resolution, resolution_snapshot
+from core.rng import use_rng
+from .events import BattleEnded, BattleStarted, ModeSet, MoveUsed, NoMoves, TurnStarted, Verbosity
 
 
 # ------------------------------
@@ -39,6 +41,13 @@ class BattleEngine:
         self.config = config
         self.registry = registry
         self.battle_mode = BattleMode.AUTO  # Default mode
+        self._turn_snapshot: tuple[int, dict] | None = None  # (turn, snapshot per fighter) in "turn" resolution
+        self._move_engine: MoveEngine | None = None  # pinned by start()
+
+    @property
+    def move_engine(self) -> MoveEngine:
+        """The move engine of the current battle, or the registry's one before any battle started."""
+        return self._move_engine if self._move_engine is not None else self.registry.get("moves")
 
     # ------------------------------
     # Battle Mode Management
@@ -46,7 +55,7 @@ class BattleEngine:
     def set_battle_mode(self, mode: BattleMode):
         """Switch between battle modes"""
         self.battle_mode = mode
-        self.battle.current_context.log_stack.append(f"Battle mode set to: {mode.value}")
+        self.battle.current_context.events.emit(ModeSet, mode.value)
 
     # ------------------------------
     # Battle Lifecycle Management
@@ -57,13 +66,18 @@ class BattleEngine:
         Initialize a battle.
         """
         self.battle = battle
-        self.battle.current_context.log_stack.append("Battle started!")
+        self._turn_snapshot = None
+        # Pin the move definitions for the whole battle, so a registry
+        # reload only affects battles started afterwards.
+        self._move_engine = self.registry.get("moves")
+        self.battle.current_context.events.verbosity = Verbosity[self.config.verbosity.upper()]
+        self.battle.current_context.events.emit(BattleStarted)
 
     def end(self):
         """
         End the current battle.
         """
-        self.battle.current_context.log_stack.append("Battle ended!")
+        self.battle.current_context.events.emit(BattleEnded)
 
     # ------------------------------
     # Event Queue
@@ -88,7 +102,7 @@ class BattleEngine:
     def process_events(self):
         """Process all queued actions"""
         while self.battle.current_context.event_queue:
-            action = self.battle.current_context.event_queue.pop(0)
+            action = self.battle.current_context.event_queue.popleft()
             action()
             # try:
             #     action()
@@ -100,12 +114,12 @@ class BattleEngine:
     # ------------------------------
     def execute_move(self, move_id: str, user: FighterVolatile, target: FighterVolatile):
         """Execute a move from a fighter on a target"""
-        move_engine = self.registry.get("moves")
+        move_engine = self.move_engine
         move = move_engine.set[move_id]
 
         # Queue the move execution
         def do_move():
-            self.battle.current_context.log_stack.append(f"{user.current_fighter.name} uses {move.name} on {target.current_fighter.name}!")
+            self.battle.current_context.events.emit(MoveUsed, user.current_fighter.name, move.name, target.current_fighter.name)
             move_engine.execute(move_id, user, target, self.battle.current_context)
 
         self.queue_action(do_move)
@@ -115,7 +129,7 @@ class BattleEngine:
         if not fighter.current_fighter.moves:
             return []
         
-        move_engine = self.registry.get("moves")
+        move_engine = self.move_engine
         moves_info = []
         for idx, move_id in enumerate(fighter.current_fighter.moves, 1):
             move = move_engine.set.get(move_id)
@@ -132,7 +146,7 @@ class BattleEngine:
         moves_info = self.get_available_moves(fighter)
         
         if not moves_info:
-            self.battle.current_context.log_stack.append(f"{fighter.current_fighter.name} has no moves!")
+            self.battle.current_context.events.emit(NoMoves, fighter.current_fighter.name)
             return None
 
         # Display available moves
@@ -155,10 +169,10 @@ class BattleEngine:
         # Get random opponent
         opponent_sides = [i for i in range(len(ctx.sides)) if i != ctx.active_side]
         if opponent_sides:
-            target_side = random.choice(opponent_sides)
+            target_side = self.battle.rng.choice(opponent_sides)
             target_fighters = ctx.sides[target_side]
             if target_fighters:
-                target = random.choice(target_fighters)
+                target = self.battle.rng.choice(target_fighters)
                 return (selected_move_id, target)
         
         return None
@@ -180,6 +194,27 @@ class BattleEngine:
         Execute a single battle step.
         selected_action: optional (move_id, target) chosen externally (e.g., UI)
         """
+        # Schemas resolve other systems (types, fighters) through this engine's
+        # registry, and DSL values read during the step sample from the battle's stream
+        with self.registry.activate(), use_rng(self.battle.rng), self._resolution_scope():
+            return self._step(selected_action)
+
+    def _resolution_scope(self):
+        """How DSL reads are resolved during this step, per the config's `resolution`."""
+        mode = self.config.resolution
+        if mode == "action":
+            return per_action_resolution()
+        if mode == "turn":
+            turn = self.battle.current_context.turn
+            if self._turn_snapshot is None or self._turn_snapshot[0] != turn:
+                self._turn_snapshot = (turn, {})
+            # One snapshot per fighter: moves and their action contexts are
+            # shared between fighters, who must not share rolls.
+            fighter = self.battle.current_context.active_fighter
+            return resolution_snapshot(self._turn_snapshot[1].setdefault(id(fighter), {}))
+        return nullcontext()
+
+    def _step(self, selected_action: tuple[str, FighterVolatile] | None) -> bool:
         if self.battle.is_battle_over:
             self.end()  # End the battle if it's over
             return False
@@ -204,7 +239,7 @@ class BattleEngine:
         else:
             # Auto mode: AI selects randomly
             if fighter.current_fighter.moves:
-                move_id = random.choice(fighter.current_fighter.moves)
+                move_id = self.battle.rng.choice(fighter.current_fighter.moves)
                 target = self._pick_default_target(fighter)
                 if target:
                     self.execute_move(move_id, fighter, target)
@@ -217,7 +252,7 @@ class BattleEngine:
         """Tick buffs for every fighter in the current battle context."""
         for side in self.battle.current_context.sides:
             for fv in side:
-                fv.tick_buffs(self.battle.current_context.log_stack)
+                fv.tick_buffs(self.battle.current_context.events)
 
     def advance_active_fighter(self):
         """
@@ -250,7 +285,7 @@ class BattleEngine:
             for i, side in enumerate(ctx.sides):
                 if ctx.active_fighter_index < len(side):
                     ctx.active_side = i
-                    ctx.log_stack.append(f"--- Turn {ctx.turn} begins ---")
+                    ctx.events.emit(TurnStarted, ctx.turn)
                     return
 
 def create_engine(battle_config : BaseModel, registry : SystemRegistry) -> BattleEngine:
@@ -0,0 +1,240 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from typing import ClassVar
+
+# ------------------------------
+# Verbosity
+# ------------------------------
+class Verbosity(IntEnum):
+    """Which events a battle records: those whose level is at most the verbosity."""
+    OFF = 0    # nothing (headless simulation)
+    INFO = 1   # what happens in the battle
+    DEBUG = 2  # plus engine internals (condition evaluation)
+
+# ------------------------------
+# Events
+# ------------------------------
+# Events hold plain values (fighter names, amounts...) read when they happen;
+# their text is only built when a log sink asks for it (str(event)).
+@dataclass(slots=True)
+class Event:
+    level: ClassVar[Verbosity] = Verbosity.INFO
+
+    def text(self) -> str:
+        raise NotImplementedError
+
+    def __str__(self):
+        return self.text()
+
+    @property
+    def kind(self) -> str:
+        return type(self).__name__
+
+    def to_dict(self) -> dict:
+        """Machine-readable form, for analytics."""
+        return {"kind": self.kind, **asdict(self)}
+
+# --- Battle flow ---
+@dataclass(slots=True)
+class BattleStarted(Event):
+    def text(self) -> str:
+        return "Battle started!"
+
+@dataclass(slots=True)
+class BattleEnded(Event):
+    def text(self) -> str:
+        return "Battle ended!"
+
+@dataclass(slots=True)
+class BattleOver(Event):
+    reason: str  # "defeated" or "max_turns"
+
+    def text(self) -> str:
+        return "All opponents defeated!" if self.reason == "defeated" else "Maximum turns reached!"
+
+@dataclass(slots=True)
+class ModeSet(Event):
+    mode: str
+
+    def text(self) -> str:
+        return f"Battle mode set to: {self.mode}"
+
+@dataclass(slots=True)
+class TurnStarted(Event):
+    turn: int
+
+    def text(self) -> str:
+        return f"--- Turn {self.turn} begins ---"
+
+@dataclass(slots=True)
+class MoveUsed(Event):
+    user: str
+    move: str
+    target: str
+
+    def text(self) -> str:
+        return f"{self.user} uses {self.move} on {self.target}!"
+
+@dataclass(slots=True)
+class NoMoves(Event):
+    fighter: str
+
+    def text(self) -> str:
+        return f"{self.fighter} has no moves!"
+
+@dataclass(slots=True)
+class NotEnoughCharge(Event):
+    user: str
+    move: str
+    required: float
+    available: float
+
+    def text(self) -> str:
+        return f"{self.user} does not have enough charge to use {self.move}. Required: {self.required}, Available: {self.available}"
+
+@dataclass(slots=True)
+class LacksCharge(Event):
+    """A move picked in the UI that the fighter can't pay for (nothing was executed)."""
+    user: str
+
+    def text(self) -> str:
+        return f"{self.user} lacks charge."
+
+# --- Action outcomes ---
+FAILED_VERBS = {"damage": "deal damage"}
+
+@dataclass(slots=True)
+class ActionFailed(Event):
+    user: str
+    action: str  # "damage", "heal", "shield", "buff", "debuff"
+
+    def text(self) -> str:
+        return f"{self.user} Failed to {FAILED_VERBS.get(self.action, self.action)}"
+
+@dataclass(slots=True)
+class Crit(Event):
+    target: str
+
+    def text(self) -> str:
+        return "Critical Hit!"
+
+@dataclass(slots=True)
+class Damage(Event):
+    target: str
+    amount: int
+
+    def text(self) -> str:
+        return f"{self.target} takes {self.amount} damage"
+
+@dataclass(slots=True)
+class Heal(Event):
+    target: str
+    amount: int
+
+    def text(self) -> str:
+        return f"{self.target} is healed for {self.amount} HP"
+
+@dataclass(slots=True)
+class Shield(Event):
+    target: str
+    amount: int
+
+    def text(self) -> str:
+        return f"{self.target} is shielded for {self.amount} HP"
+
+@dataclass(slots=True)
+class BuffApplied(Event):
+    target: str
+    stat: str
+    amount: int  # negative for a debuff
+    duration: int
+
+    def text(self) -> str:
+        verb = "loses" if self.amount < 0 else "gains"
+        return f"{self.target} {verb} {self.amount} {self.stat} for {self.duration} turn(s)"
+
+@dataclass(slots=True)
+class BuffExpired(Event):
+    fighter: str
+    stat: str
+
+    def text(self) -> str:
+        return f"{self.fighter}'s {self.stat} buff expired"
+
+@dataclass(slots=True)
+class StatModified(Event):
+    target: str
+    field: str
+    value: object
+
+    def text(self) -> str:
+        return f"{self.target}'s {self.field} is modified to {self.value}"
+
+@dataclass(slots=True)
+class StatusApplied(Event):
+    target: str
+    status: str
+    duration: float
+
+    def text(self) -> str:
+        return f"Applying status '{self.status}' to {self.target} for {self.duration} turns !"
+
+@dataclass(slots=True)
+class StatusRemoved(Event):
+    target: str
+
+    def text(self) -> str:
+        return f"Removing status from {self.target} !"
+
+@dataclass(slots=True)
+class TextShown(Event):
+    message: str
+    style: object
+
+    def text(self) -> str:
+        return f"Writing text '{self.message}' with style '{self.style}'"
+
+@dataclass(slots=True)
+class ConditionEvaluated(Event):
+    level: ClassVar[Verbosity] = Verbosity.DEBUG
+    condition: str
+    value: object
+
+    def text(self) -> str:
+        return f"Evaluating condition '{self.condition}' with value '{self.value}'"
+
+# ------------------------------
+# Event log
+# ------------------------------
+class EventLog:
+    """
+    Events of a battle: pending until read (drain), then kept in history.
+    Events above the verbosity are not even built.
+    """
+    __slots__ = ("verbosity", "pending", "history")
+
+    def __init__(self, verbosity: Verbosity = Verbosity.DEBUG):
+        self.verbosity = verbosity
+        self.pending: deque[Event] = deque()
+        self.history: list[Event] = []
+
+    def enabled(self, kind: type[Event]) -> bool:
+        """Whether `kind` events are recorded: check it before computing costly event values."""
+        return kind.level <= self.verbosity
+
+    def emit(self, kind: type[Event], *args) -> None:
+        """Record a `kind` event built from `args`, if the verbosity keeps it."""
+        if kind.level <= self.verbosity:
+            self.pending.append(kind(*args))
+
+    def drain(self) -> list[Event]:
+        """The pending events, oldest first, moved to history."""
+        events = list(self.pending)
+        self.pending.clear()
+        self.history.extend(events)
+        return events
+
+    def __len__(self):
+        return len(self.pending)
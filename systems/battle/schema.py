@@ -1,23 +1,24 @@
 from __future__ import annotations
 from pydantic import Field, PrivateAttr, model_validator
-from typing import Callable, Optional
+from collections import deque
+from typing import Callable, Deque, Literal, Optional
 from core.dsl.random_dsl import RINT, RNUM, RSTR, RVAL, check
 import copy
 import inspect
+import random
 import warnings
 
 from core.dsl.resolvable import ResolvableModel
 from ..fighters.schema import Buff, Fighter, FighterStats, Status
-from core.registry import registry
+from core.registry import SystemRegistry, current_registry
+from core.rng import current_rng, new_seed, use_rng
+from .events import BattleOver, BuffExpired, Event, EventLog
 
 TYPE = ("dev", "opti", "syst", "data", "proj", "team", "none")
 MAX_BUFFS = 4
 MAX_SIDE = 2
 MAX_TURN = 30
 
-# to load fighters system
-import systems.fighters
-
 # ------------------------------
 # Fighter Volatile
 # ------------------------------
@@ -34,8 +35,10 @@ class FighterVolatile(ResolvableModel):
     _current_status: list[Status] = PrivateAttr(default_factory=list)
     _buffed_max_stats: FighterStats | None = PrivateAttr(default=None)
     _base_max_stats: FighterStats | None = PrivateAttr(default=None)
+    _registry: SystemRegistry | None = PrivateAttr(default=None)  # registry the fighter was created from
 
     def model_post_init(self, __context=None):
+        self._registry = current_registry()
         base = self.base_fighter
         if base is None:
             raise ValueError(f"FighterVolatile references unknown fighter id: {self.base_id}")
@@ -58,7 +61,8 @@ class FighterVolatile(ResolvableModel):
                     merged_stats.__setattr__(k, v)
             merged_data["stats"] = merged_stats
 
-            self.current_fighter = Fighter(**merged_data)
+            with self._registry.activate():
+                self.current_fighter = Fighter(**merged_data)
 
         # Merge buffs/status defaults
         base_buffs = copy.deepcopy(base.starting_buffs)
@@ -70,7 +74,7 @@ class FighterVolatile(ResolvableModel):
 
     @property
     def base_fighter(self) -> Optional[Fighter]:
-        return registry.get("fighters").set.get(self.base_id, None)
+        return (self._registry or current_registry()).get("fighters").set.get(self.base_id, None)
 
     @property
     def alive(self) -> bool:
@@ -88,7 +92,7 @@ class FighterVolatile(ResolvableModel):
     def current_stats(self, new_stats: FighterStats):
         for k, v in new_stats.model_dump().items():
             setattr(self.current_fighter.stats, k, v)
-        FighterStats.model_validate(self.current_fighter.stats)
+        self.current_fighter.stats.clamp()
         self._recompute_buffs()
 
     @property
@@ -120,7 +124,8 @@ class FighterVolatile(ResolvableModel):
                 self.current_fighter.moves[i] = move
             else:
                 self.current_fighter.moves.append(move)
-        Fighter.model_validate(self.current_fighter)
+        with self._registry.activate():
+            Fighter.model_validate(self.current_fighter)
 
     @property
     def current_status(self) -> list[Status]:
@@ -136,7 +141,7 @@ class FighterVolatile(ResolvableModel):
             if buff.stat in max_stats.model_fields:
                 new_val = getattr(max_stats, buff.stat) + buff.amount
                 setattr(max_stats, buff.stat, max(0, new_val))
-        FighterStats.model_validate(max_stats)
+        max_stats.clamp()
         return max_stats
 
     def _rebalance_current_against_new_max(self, new_max: FighterStats):
@@ -175,7 +180,7 @@ class FighterVolatile(ResolvableModel):
         if self.current_stats.hp < 0:
             self.current_stats.hp = 0
     
-    def tick_buffs(self, log_stack=None):
+    def tick_buffs(self, events: EventLog | None = None):
         """
         Decrement finite buffs by 1; remove those that reach 0.
         duration == -1 is infinite.
@@ -198,9 +203,9 @@ class FighterVolatile(ResolvableModel):
         # Reassign via setter to trigger rebalance
         self.current_buffs = new_buffs
 
-        if log_stack is not None:
+        if events is not None:
             for b in expired:
-                log_stack.append(f"{self.current_fighter.name}'s {b.stat} buff expired")
+                events.emit(BuffExpired, self.current_fighter.name, b.stat)
     
     def add_stat(self, stat: str, amount: int | float) -> int:
         """
@@ -251,7 +256,7 @@ class FighterVolatile(ResolvableModel):
     @classmethod
     def validate_id_or_abort(cls, data):
         base_id = data.get("base_id", "")
-        fighter_set = registry.get("fighters").set
+        fighter_set = current_registry().get("fighters").set
         if base_id not in fighter_set:
             warnings.warn(f"Fighter id '{base_id}' not found.", stacklevel=2)
             return None
@@ -276,9 +281,18 @@ class BattleContext(ResolvableModel):
 
     sides: list[list[FighterVolatile]] = Field(default_factory=dict) # "left" and "right" sides
 
-    event_queue: list[Callable] = Field(default_factory=list)  # queued actions to process
-    log_stack: list[str] = Field(default_factory=list)  # current log stack
-    log_history: list[str] = Field(default_factory=list)  # full log history
+    event_queue: Deque[Callable] = Field(default_factory=deque)  # queued actions to process
+    _events: EventLog = PrivateAttr(default_factory=EventLog)  # what happened, see events.py
+    _rng: random.Random | None = PrivateAttr(default=None)  # the owning battle's stream
+
+    @property
+    def rng(self):
+        """Random stream of the battle this context belongs to."""
+        return self._rng if self._rng is not None else current_rng()
+
+    @property
+    def events(self) -> EventLog:
+        return self._events
 
     @model_validator(mode="before")
     @classmethod
@@ -367,13 +381,13 @@ class BattleContext(ResolvableModel):
             if fighter in fighters:
                 return side
         raise ValueError(f"Fighter {fighter.base_id} not found in either side.")
+    def get_next_events(self) -> list[Event]:
+        """Events recorded since the last call, oldest first."""
+        return self._events.drain()
+
     def get_next_logs(self) -> list[str]:
-        next_logs = []
-        while(self.log_stack):
-            next_log = self.log_stack.pop(0)
-            next_logs.append(next_log)
-            self.log_history.append(next_log)
-        return next_logs
+        """Text of the events recorded since the last call."""
+        return [event.text() for event in self._events.drain()]
 
     @classmethod
     def from_sides(
@@ -401,7 +415,7 @@ class BattleContext(ResolvableModel):
             turn=turn,
             active_side=active_side,
             active_fighter_index=active_fighter_index,
-            event_queue=event_queue or [],
+            event_queue=event_queue or deque(),
             log=log or [],
         )
 
@@ -420,18 +434,31 @@ class Battle(ResolvableModel):
     base_context: BattleContext = Field(default_factory=BattleContext)
     current_context: Optional[BattleContext] = None  # mutable, per-battle context
 
+    # Every random draw of the battle comes from this seed: same seed and
+    # same player choices give the same battle. None draws one from `random`.
+    seed: Optional[int] = None
+    _rng: random.Random = PrivateAttr(default=None)
+
     def model_post_init(self, __context=None):
         check("max_turns >= 0", max_turns=self.max_turns)
+        if self.seed is None:
+            self.seed = new_seed()
+        self._rng = random.Random(self.seed)
         if self.current_context is None:
             self.current_context = copy.deepcopy(self.base_context)
+        self.current_context._rng = self._rng
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
 
     @property
     def is_battle_over(self) -> bool:
         if sum(self.current_context.sides_alive) <= 1:
-            self.current_context.log_stack.append("All opponents defeated!")
+            self.current_context.events.emit(BattleOver, "defeated")
             return True
         if self.current_context.turn >= self.max_turns:
-            self.current_context.log_stack.append("Maximum turns reached!")
+            self.current_context.events.emit(BattleOver, "max_turns")
             return True
         return False
 
@@ -444,8 +471,13 @@ class Battle(ResolvableModel):
         max_turns: int = MAX_TURN,
         background_sprite: str | None = None,
         music: str | None = None,
+        seed: int | None = None,
     ) -> Battle:
-        base_ctx = BattleContext.from_sides(sides)
+        seed = new_seed() if seed is None else seed
+        rng = random.Random(seed)
+        # fighters' starting values are rolled from the battle's stream too
+        with use_rng(rng):
+            base_ctx = BattleContext.from_sides(sides)
 
         battle = cls(
             id=id,
@@ -453,9 +485,12 @@ class Battle(ResolvableModel):
             background_sprite=background_sprite or "backgrounds/default_battle.png",
             music=music,
             base_context=base_ctx,
+            seed=seed,
         )
 
+        battle._rng = rng
         battle.current_context = copy.deepcopy(base_ctx)
+        battle.current_context._rng = rng
         return battle
 
 # ------------------------------
@@ -463,4 +498,12 @@ class Battle(ResolvableModel):
 # ------------------------------
 
 class BattleConfig(ResolvableModel):
-    pass
\ No newline at end of file
+    # How often DSL values (e.g. a move's "r[10,20]" amount) are rolled:
+    #   "read":   on every read, so two reads in one damage calculation can differ
+    #   "action": once per executed action (each hit of a repeat rolls again),
+    #             shared by all the reads of that action
+    #   "turn":   once per turn and fighter, shared by all of that fighter's reads
+    resolution: Literal["read", "action", "turn"] = "action"
+    # Which battle events are recorded (see events.Verbosity): "off" makes
+    # emitting them a no-op in headless simulation, "debug" keeps everything
+    verbosity: Literal["off", "info", "debug"] = "debug"
\ No newline at end of file
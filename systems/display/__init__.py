@@ -4,9 +4,11 @@ from .engine import create_engine as create_display
 
 DATA_FILE = "display.json"
 
-registry.add_spec(SystemSpec(
+SPEC = SystemSpec(
     name="display",
     schema=DisplayConfig,
     engine_factory=create_display,
-    data_file=DATA_FILE
-))
+    data_file=DATA_FILE,
+    main_thread=True,  # pygame window and event loop
+)
+registry.add_spec(SPEC)
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from .title import TitleScreen
 
 from systems.battle.engine import BattleMode
+from systems.battle.events import LacksCharge
 
 import math
 
@@ -1149,7 +1150,7 @@ class BattleController:
         self.battle_ended = False
 
     def current_moves(self, fv):
-        move_engine = self.engine.registry.get("moves")
+        move_engine = self.battle_engine.move_engine
         return [
             move_engine.set[m]
             for m in fv.current_fighter.moves
@@ -1166,7 +1167,7 @@ class BattleController:
 
         move = moves[idx]
         if user.current_stats.charge < move.charge_usage:
-            ctx.log_stack.append(f"{user.current_fighter.name} lacks charge.")
+            ctx.events.emit(LacksCharge, user.current_fighter.name)
             return
 
         # Immediately display any queued logs (and any new logs from context)
@@ -4,9 +4,11 @@ from .engine import create_engine as create_fighters
 
 DATA_FILE = "fighters.json"
 
-registry.add_spec(SystemSpec(
+SPEC = SystemSpec(
     name="fighters",
     schema=FighterSet,
     engine_factory=create_fighters,
-    data_file=DATA_FILE
-))
\ No newline at end of file
+    data_file=DATA_FILE,
+    depends_on=("moves",),
+)
+registry.add_spec(SPEC)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 import copy
-from pydantic import Field, RootModel, model_validator
+from pydantic import Field, RootModel, ValidationInfo, model_validator
 from typing import Dict, Optional
 from core.dsl.random_dsl import RINT, RNUM, RSTR, RVAL, check
 import warnings
 from core.dsl.resolvable import ResolvableModel
-from core.registry import registry
+from core.registry import current_registry
 
 TYPE = ("dev", "opti", "syst", "data", "proj", "team", "none")
 STATUS = ("javaBien", "poison")
@@ -18,6 +18,14 @@ MAX_DEFENSE = 999
 MAX_SHIELD = 999
 MAX_CHARGE = 999
 MAX_CHARGE_BONUS = 10.0
+STAT_CAPS = {
+    "hp": MAX_HP,
+    "attack": MAX_ATTACK,
+    "defense": MAX_DEFENSE,
+    "shield": MAX_SHIELD,
+    "charge": MAX_CHARGE,
+    "charge_bonus": MAX_CHARGE_BONUS,
+}
 
 # ------------------------------
 # Fighter Stats
@@ -68,6 +76,20 @@ class FighterStats(ResolvableModel):
 
         return self
 
+    def clamp(self) -> FighterStats:
+        """
+        Same clamping as check_or_clamp, with plain comparisons, for stats the
+        engine changes at runtime (buffs, damage) rather than authored ones.
+        """
+        if self.shield is None:
+            self.shield = self.hp
+        for name, cap in STAT_CAPS.items():
+            if not 0 <= getattr(self, name) <= cap:
+                setattr(self, name, cap)
+        if not self.shield <= self.hp:
+            self.shield = self.hp
+        return self
+
 
 Stat = tuple(FighterStats().model_dump().keys())
 
@@ -105,12 +127,6 @@ class Status(ResolvableModel):
             raise ValueError(f"Invalid status id: {self.id}")
         return self
 
-# To avoid circular imports while still loading the moves system.
-# You could argue that the issue stems from putting buff and status
-# definitions here instead of in their own module, but this is simpler
-# and make more sense as buffs and statuses are tightly coupled with fighters
-from ..import moves
-
 # ------------------------------
 # Fighter Schema
 # ------------------------------
@@ -136,8 +152,12 @@ class Fighter(ResolvableModel):
     starting_buffs: list[Buff] = Field(default_factory=list) # optional starting buffs
     starting_status: list[Status] = Field(default_factory=list) # optional starting status effects
 
+    def references(self) -> dict[str, list[str]]:
+        """Ids this fighter uses from other systems, for partial reloads."""
+        return {"moves": self.moves}
+
     @model_validator(mode="after")
-    def check_fighter(self):
+    def check_fighter(self, info: ValidationInfo):
         try:
             check("1 <= len(id) <= 63", id=self.id)
         except ValueError:
@@ -155,7 +175,9 @@ class Fighter(ResolvableModel):
                   type=self.type, types=TYPE)
         except ValueError:
             raise ValueError(f"Invalid fighter type: {self.type}")
-        move_set = registry.get("moves").set
+        # A reload validates against the move set it is about to swap in.
+        configs = (info.context or {}).get("configs", {})
+        move_set = configs["moves"] if "moves" in configs else current_registry().get("moves").set
         for m in self.moves:
             if m not in move_set:
                 raise ValueError(f"Fighter '{self.id}' references unknown move '{m}'")
@@ -4,9 +4,11 @@ from .engine import create_engine as create_moves
 
 DATA_FILE = "moves.json"
 
-registry.add_spec(SystemSpec(
+SPEC = SystemSpec(
     name="moves",
     schema=MoveSet,
     engine_factory=create_moves,
-    data_file=DATA_FILE
-))
\ No newline at end of file
+    data_file=DATA_FILE,
+    schema_version=3,  # 2: precomputed action contexts, 3: text actions validated
+)
+registry.add_spec(SPEC)
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
 
 from .action import ActionHandler
+from ...battle.events import ActionFailed, BuffApplied
 from ...fighters.schema import Buff
 
 class BuffHandler(ActionHandler):
@@ -36,7 +37,7 @@ class BuffHandler(ActionHandler):
         amount = int(round(move.get_effective_amount(user, target, move_ctx)))
 
         if amount <= 0:
-            battle_ctx.log_stack.append(f"{user.current_fighter.name} Failed to {"debuff" if action.reverse else "buff"}")
+            battle_ctx.events.emit(ActionFailed, user.current_fighter.name, "debuff" if action.reverse else "buff")
             return False
 
         # Debuff support: reverse flag on the action payload
@@ -50,9 +51,10 @@ class BuffHandler(ActionHandler):
         raw_duration = move_ctx.duration
         adj_duration = raw_duration if raw_duration <= 0 else raw_duration + 1
 
-        # Build Buff objects with duration from move_ctx
+        # Build Buff objects with duration from move_ctx (stats and duration
+        # were validated with the move, so skip Buff's validators)
         new_buffs = [
-            Buff(stat=stat, amount=amount, duration=adj_duration)
+            Buff.trusted(stat=stat, amount=amount, duration=adj_duration)
             for stat in stats
         ]
 
@@ -60,9 +62,6 @@ class BuffHandler(ActionHandler):
         buff_target.current_buffs = (buff_target.current_buffs or []) + new_buffs
 
         # Logging
-        verb = "loses" if amount < 0 else "gains"
         for stat in stats:
-            battle_ctx.log_stack.append(
-                f"{buff_target.current_fighter.name} {verb} {amount} {stat} for {raw_duration} turn(s)"
-            )
+            battle_ctx.events.emit(BuffApplied, buff_target.current_fighter.name, stat, amount, raw_duration)
         return True
\ No newline at end of file
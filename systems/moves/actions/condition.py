@@ -7,12 +7,13 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
     
 from .action import ActionHandler
+from ...battle.events import ConditionEvaluated
 
 
 class ConditionHandler(ActionHandler):
     def execute(self, engine : MoveEngine, action : ActionBase, user: FighterVolatile | None = None, target: FighterVolatile | None = None,  battle_ctx : BattleContext | None = None, move_ctx: MoveContext | None = None, move: Move | None = None):
         for condition in action.conditions:
-            battle_ctx.log_stack.append(f"Evaluating condition '{condition.id}' with value '{condition.value}'")
+            battle_ctx.events.emit(ConditionEvaluated, condition.id, condition.value)
             # if not check_condition(condition.id, condition.value, ctx): return
 
             # Evaluate all conditions with AND logic
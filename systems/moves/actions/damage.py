@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
 
 from .action import ActionHandler
+from ...battle.events import ActionFailed, Crit, Damage
 import math
 
 AD_BASELINE = 1.0
@@ -38,15 +39,15 @@ class DamageHandler(ActionHandler):
         effective_damage = effective_amount * ad_factor
 
         if effective_damage <= 0:
-            battle_ctx.log_stack.append(f"{user.current_fighter.name} Failed to deal damage")
+            battle_ctx.events.emit(ActionFailed, user.current_fighter.name, "damage")
             return False
         
-        if action.is_critical:
+        if action.is_critical(battle_ctx.rng):
             effective_damage *= action.crit_damage
-            battle_ctx.log_stack.append("Critical Hit!")
+            battle_ctx.events.emit(Crit, target.current_fighter.name)
 
         effective_damage = int(round(effective_damage))
 
-        battle_ctx.log_stack.append(f"{target.current_fighter.name} takes {effective_damage} damage")
+        battle_ctx.events.emit(Damage, target.current_fighter.name, effective_damage)
         target.take_damage(effective_damage)
         return True
\ No newline at end of file
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
 
 from .action import ActionHandler
+from ...battle.events import ActionFailed, Heal
 import math
 
 
@@ -27,8 +28,8 @@ class HealHandler(ActionHandler):
         effective_amount = max(0, int(round(move.get_effective_amount(user, target, move_ctx))))
         gained = target.add_stat("hp", effective_amount)
         if gained <= 0:
-            battle_ctx.log_stack.append(f"{user.current_fighter.name} Failed to heal")
+            battle_ctx.events.emit(ActionFailed, user.current_fighter.name, "heal")
             return False
 
-        battle_ctx.log_stack.append(f"{target.current_fighter.name} is healed for {gained} HP")
+        battle_ctx.events.emit(Heal, target.current_fighter.name, gained)
         return True
\ No newline at end of file
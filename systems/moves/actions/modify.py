@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
     
 from .action import ActionHandler
+from ...battle.events import StatModified
 
 
 class ModifyHandler(ActionHandler):
@@ -17,4 +18,4 @@ class ModifyHandler(ActionHandler):
         # Complicated asf logic for modifying a field on a target
         # So not gonna implement it fully for now
 
-        battle_ctx.log_stack.append(f"{target.current_fighter.name}'s {field} is modified to {value}")
\ No newline at end of file
+        battle_ctx.events.emit(StatModified, target.current_fighter.name, field, value)
\ No newline at end of file
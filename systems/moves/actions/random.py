@@ -1,6 +1,5 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-import random
 
 if TYPE_CHECKING:
     from ...battle.schema import BattleContext, FighterVolatile
@@ -8,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
 
 from .action import ActionHandler
+from core.rng import current_rng
 
 
 class RandomHandler(ActionHandler):
@@ -28,5 +28,6 @@ class RandomHandler(ActionHandler):
         if sum(weights) == 0:
             return False # no valid choices
 
-        choice_action = random.choices(action.choices, weights=weights, k=1)[0].action
+        rng = battle_ctx.rng if battle_ctx is not None else current_rng()
+        choice_action = rng.choices(action.choices, weights=weights, k=1)[0].action
         return engine._execute_action(choice_action, user, target, battle_ctx, move_ctx, move)
\ No newline at end of file
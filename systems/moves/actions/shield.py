@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
 
 from .action import ActionHandler
+from ...battle.events import ActionFailed, Shield
 import math
 
 
@@ -27,8 +28,8 @@ class ShieldHandler(ActionHandler):
         effective_amount = max(0, int(round(move.get_effective_amount(user, target, move_ctx))))
         gained = target.add_shield(effective_amount)
         if gained <= 0:
-            battle_ctx.log_stack.append(f"{user.current_fighter.name} Failed to shield")
+            battle_ctx.events.emit(ActionFailed, user.current_fighter.name, "shield")
             return False
 
-        battle_ctx.log_stack.append(f"{target.current_fighter.name} is shielded for {gained} HP")
+        battle_ctx.events.emit(Shield, target.current_fighter.name, gained)
         return True
\ No newline at end of file
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
     
 from .action import ActionHandler
+from ...battle.events import StatusApplied, StatusRemoved
 
 
 class StatusHandler(ActionHandler):
@@ -18,6 +19,8 @@ class StatusHandler(ActionHandler):
         # don't care about amount when removing
         for status in status:
             if action.operation == "add":
-                battle_ctx.log_stack.append(f"Applying status '{status}' to {target.current_fighter.name} for {move.get_effective_amount(user, target)} turns !")
+                # the amount is only shown: not resolved when the event is filtered out
+                if battle_ctx.events.enabled(StatusApplied):
+                    battle_ctx.events.emit(StatusApplied, target.current_fighter.name, status, move.get_effective_amount(user, target))
             elif action.operation == "remove":
-                battle_ctx.log_stack.append(f"Removing status from {target.current_fighter.name} !")
\ No newline at end of file
+                battle_ctx.events.emit(StatusRemoved, target.current_fighter.name)
\ No newline at end of file
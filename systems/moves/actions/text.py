@@ -7,9 +7,10 @@ if TYPE_CHECKING:
     from ..engine import MoveEngine
     
 from .action import ActionHandler
+from ...battle.events import TextShown
 
 
 class TextHandler(ActionHandler):
     def execute(self, engine : MoveEngine, action : ActionBase, user: FighterVolatile | None = None, target: FighterVolatile | None = None,  battle_ctx : BattleContext | None = None, move_ctx: MoveContext | None = None, move: Move | None = None):
 
-        battle_ctx.log_stack.append(f"Writing text '{action.text}' with style '{action.style}'")
\ No newline at end of file
+        battle_ctx.events.emit(TextShown, action.text, action.style)
\ No newline at end of file
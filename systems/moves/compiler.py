@@ -0,0 +1,206 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import random
+    from .schema import ActionBase, Move
+    from ..battle.schema import BattleContext, FighterVolatile
+    from .actions.action import ActionHandler
+    from .engine import MoveEngine
+
+from core.dsl.resolvable import action_snapshot
+from .actions.condition import ConditionHandler
+from .actions.random import RandomHandler
+from .actions.repeat import RepeatHandler
+from ..battle.events import ConditionEvaluated
+
+# ------------------------------
+# Instructions
+# ------------------------------
+# A move's action tree lowered to a flat list of tuples, opcode first. Each
+# action becomes a contiguous block; control actions (repeat, random,
+# condition) open a frame holding their context and close it with a
+# matching instruction, which also settles their success and recharge.
+#   (CALL, action, handler, ctx, overrides, gated, with_move)
+#   (REPEAT, action, ctx, overrides, gated, exit)  ... (ACC) after each sub-action ... (LOOP, body)
+#   (RANDOM, action, ctx, overrides, gated, exit, branches)  ... each branch ends with (JOIN, exit)
+#   (CONDITION, action, ctx, overrides, gated, exit)  ... (END,)
+# ctx/overrides are the action's context precomputed at load (runtime
+# overrides are layered on when given); gated: the action sets its own
+# chance; with_move: the handler gets the move (not under a condition,
+# whose handler runs its sub-actions without it).
+CALL, REPEAT, ACC, LOOP, RANDOM, JOIN, CONDITION, END = range(8)
+
+class Program:
+    """A move compiled against an engine's action handlers."""
+    __slots__ = ("move", "code")
+
+    def __init__(self, move: Move, code: tuple[tuple, ...]):
+        self.move = move
+        self.code = code
+
+    def __len__(self):
+        return len(self.code)
+
+class _MissingHandler:
+    """Stands in for an unregistered handler: fails when (if ever) reached, like a dispatch would."""
+    def __init__(self, action_id: str):
+        self.action_id = action_id
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError(f"No handler registered for action '{self.action_id}'")
+
+# ------------------------------
+# Compiler
+# ------------------------------
+def compile_move(move: Move, handlers: dict[str, ActionHandler]) -> Program:
+    """
+    Lower a move's actions to a Program. Control actions are inlined only
+    when handled by the stock handlers; any other handler is called as is
+    (and may recurse through MoveEngine._execute_action).
+    """
+    code: list[tuple] = []
+    for action in move.actions:
+        _emit(code, action, handlers, with_move=True)
+    return Program(move, tuple(code))
+
+def _emit(code: list[tuple], action: ActionBase, handlers: dict[str, ActionHandler], with_move: bool) -> None:
+    handler = handlers.get(action.id) or _MissingHandler(action.id)
+    ctx, overrides = action._context, action._overrides
+    gated = hasattr(action, "chance")
+    kind = type(handler)
+
+    if kind is RepeatHandler:
+        at = len(code)
+        code.append(None)
+        for sub_action in action.actions:
+            _emit(code, sub_action, handlers, with_move)
+            code.append((ACC,))
+        code.append((LOOP, at + 1))
+        code[at] = (REPEAT, action, ctx, overrides, gated, len(code))
+    elif kind is RandomHandler:
+        at = len(code)
+        code.append(None)
+        branches, joins = [], []
+        for choice in action.choices:
+            branches.append(len(code))
+            _emit(code, choice.action, handlers, with_move)
+            joins.append(len(code))
+            code.append(None)
+        for join in joins:
+            code[join] = (JOIN, len(code))
+        code[at] = (RANDOM, action, ctx, overrides, gated, len(code), tuple(branches))
+    elif kind is ConditionHandler:
+        at = len(code)
+        code.append(None)
+        for sub_action in action.actions:
+            _emit(code, sub_action, handlers, with_move=False)
+        code.append((END,))
+        code[at] = (CONDITION, action, ctx, overrides, gated, len(code))
+    else:
+        code.append((CALL, action, handler, ctx, overrides, gated, with_move))
+
+# ------------------------------
+# Interpreter
+# ------------------------------
+def run(
+    program: Program,
+    engine: MoveEngine,
+    user: FighterVolatile | None,
+    target: FighterVolatile | None,
+    battle_ctx: BattleContext | None,
+    runtime: dict | None,
+    rng: random.Random,
+) -> None:
+    """
+    Execute a Program; same semantics as walking the actions through
+    MoveEngine._execute_action and the stock control handlers.
+    """
+    code = program.code
+    move = program.move
+    size = len(code)
+    frames: list[list] = []  # [ctx] or, for repeats, [ctx, remaining, any_success]
+    result = None  # outcome of the last finished action
+    pc = 0
+    while pc < size:
+        ins = code[pc]
+        op = ins[0]
+        if op == CALL:
+            _, action, handler, ctx, overrides, gated, with_move = ins
+            pc += 1
+            with action_snapshot():
+                if gated and rng.random() > _chance(action):
+                    result = None
+                    continue
+                if runtime is not None:
+                    ctx = ctx.layered(runtime, overrides)
+                result = handler.execute(engine, action, user, target, battle_ctx, ctx, move if with_move else None) is not False
+                if result:
+                    _recharge(user, ctx)
+        elif op == ACC:
+            frame = frames[-1]
+            frame[2] = frame[2] or bool(result)
+            pc += 1
+        elif op == LOOP:
+            frame = frames[-1]
+            frame[1] -= 1
+            if frame[1] > 0:
+                pc = ins[1]
+                continue
+            frames.pop()
+            result = frame[2]
+            if result:
+                _recharge(user, frame[0])
+            pc += 1
+        elif op == JOIN:
+            # a random action succeeds unless its pick reported failure
+            result = result is not False
+            if result:
+                _recharge(user, frames.pop()[0])
+            else:
+                frames.pop()
+            pc = ins[1]
+        elif op == END:
+            # a condition action always succeeds
+            result = True
+            _recharge(user, frames.pop()[0])
+            pc += 1
+        else:
+            _, action, ctx, overrides, gated, exit = ins[:6]
+            # the action's own reads (chance, count, weights, conditions) share one snapshot
+            with action_snapshot():
+                if gated and rng.random() > _chance(action):
+                    result = None
+                    pc = exit
+                    continue
+                if runtime is not None:
+                    ctx = ctx.layered(runtime, overrides)
+                if op == REPEAT:
+                    count = int(round(action.count))
+                    if count <= 0:
+                        result = False
+                        pc = exit
+                        continue
+                    frames.append([ctx, count, False])
+                    pc += 1
+                elif op == RANDOM:
+                    weights = [c.weight() if callable(c.weight) else c.weight for c in action.choices]
+                    if sum(weights) == 0:
+                        result = False  # no valid choices
+                        pc = exit
+                        continue
+                    frames.append([ctx])
+                    pc = rng.choices(ins[6], weights=weights, k=1)[0]
+                else:  # CONDITION
+                    for condition in action.conditions:
+                        battle_ctx.events.emit(ConditionEvaluated, condition.id, condition.value)
+                    frames.append([ctx])
+                    pc += 1
+
+def _chance(action: ActionBase):
+    return action.chance() if callable(action.chance) else action.chance
+
+def _recharge(user: FighterVolatile | None, ctx) -> None:
+    """Recharge the user's charge after an action succeeded."""
+    recharge = ctx.charge_recharge  # read once: it may be a DSL value
+    if user and recharge > 0:
+        user.add_stat("charge", recharge*user.current_stats.charge_bonus)
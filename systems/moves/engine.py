@@ -1,5 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
+import atexit
+import os
+from pathlib import Path
+import time
 import warnings
 if TYPE_CHECKING:
     from pydantic import BaseModel
@@ -10,7 +14,11 @@ if TYPE_CHECKING:
 
 from .schema import Move, MoveContext
 from .handlers import ACTION_HANDLERS
-import random
+from .compiler import Program, compile_move, run
+from ..battle.events import NotEnoughCharge
+from core.dsl.resolvable import action_snapshot
+from core.profiling import CallStats, ExecutionProfile
+from core.rng import current_rng, use_rng
 
 
 class MoveEngine:
@@ -21,6 +29,8 @@ class MoveEngine:
         self.set = set
         self.registry = registry
         self.action_handlers = action_handlers or {}
+        self._programs: dict[str, Program] = {}  # compiled moves, by move id
+        self.profile: ExecutionProfile | None = None  # see enable_profiling
 
     def execute(self, move_id: str, user: FighterVolatile | None = None, target: FighterVolatile | None = None, battle_ctx: BattleContext | None = None, runtime_ctx: MoveContext | None = None):
         """
@@ -28,52 +38,68 @@ class MoveEngine:
 
         - battle_ctx: full battle context, for battle-aware logic
         - runtime_ctx: MoveContext overrides (per move execution)
+        Random draws come from the battle's stream (battle_ctx.rng).
         """
+        rng = battle_ctx.rng if battle_ctx is not None else current_rng()
+        with use_rng(rng):
+            self._execute_move(move_id, user, target, battle_ctx, runtime_ctx, rng)
+
+    def _execute_move(self, move_id: str, user: FighterVolatile | None, target: FighterVolatile | None, battle_ctx: BattleContext | None, runtime_ctx: MoveContext | None, rng) -> bool:
+        """Returns whether the move went off (it was paid for and passed its chance)."""
         move = self.set[move_id]
-        if user and move.charge_usage > user.current_stats.charge:
-            battle_ctx.log_stack.append(f"{user.current_fighter.name} does not have enough charge to use {move.name}. Required: {move.charge_usage}, Available: {user.current_stats.charge}")
-            return
+        charge_usage = move.charge_usage  # read once: it may be a DSL value
+        if user and charge_usage > user.current_stats.charge:
+            battle_ctx.events.emit(NotEnoughCharge, user.current_fighter.name, move.name, charge_usage, user.current_stats.charge)
+            return False
 
-        user.current_stats.charge -= move.charge_usage
+        user.current_stats.charge -= charge_usage
 
         # This chance gates the entire move.
         # Action chances are independent and NOT inherited.
-        if random.random() > move.chance:
-            return
+        if rng.random() > move.chance:
+            return False
 
-        # Start from default Context, then merge move overrides,
-        base_ctx = MoveContext()
-        move_ctx = merge_context(base_ctx, move)
-        exec_ctx = move_ctx
+        # Default context with the move's overrides (merged at load),
+        # then the runtime overrides
+        exec_ctx = move.context(runtime_ctx)
 
-        if runtime_ctx is not None:
-            exec_ctx = exec_ctx.model_copy(update=runtime_ctx.model_dump())
+        # Execute the actions in sequence
+        run(self.program(move), self, user, target, battle_ctx, exec_ctx._runtime, rng)
+        return True
 
-        # Execute each action in sequence
-        for action in move.actions:
-            self._execute_action(action, user, target, battle_ctx, exec_ctx, move)
+    def program(self, move: Move) -> Program:
+        """The move compiled against this engine's handlers (compiled on first use)."""
+        program = self._programs.get(move.id)
+        if program is None or program.move is not move:
+            program = self._programs[move.id] = compile_move(move, self.action_handlers)
+        return program
 
     def _execute_action(self, action: ActionBase, user: FighterVolatile | None = None, target: FighterVolatile | None = None,  battle_ctx: BattleContext | None = None, parent_ctx: MoveContext | None = None, move: Move | None = None) -> bool:
         """
         Execute a single action with proper context propagation.
+        Moves run compiled (see compiler.py); this is the path of handlers
+        that execute sub-actions themselves.
         """
         if not action:
             raise RuntimeError("Cannot execute empty action")
-        # merge context with action overrides
-        ctx = merge_context(parent_ctx, action)
-
-        # Only applies if the action explicitly defines `chance`.
-        # Otherwise, action chance is implicitly 100%.
-        if hasattr(action, "chance"):
-            if random.random() > (action.chance() if callable(action.chance) else action.chance):
-                return
-            
-        # Dispatch action execution
-        success = self._dispatch(action, user, target, battle_ctx, ctx, move)
-
-        # Recharge charge for the user per executed action IF it succeeded
-        if success and user and ctx.charge_recharge > 0:
-            user.add_stat("charge", ctx.charge_recharge*user.current_stats.charge_bonus)
+        # context with action overrides (merged at load)
+        ctx = action.context(parent_ctx)
+
+        with action_snapshot():
+            # Only applies if the action explicitly defines `chance`.
+            # Otherwise, action chance is implicitly 100%.
+            if hasattr(action, "chance"):
+                rng = battle_ctx.rng if battle_ctx is not None else current_rng()
+                if rng.random() > (action.chance() if callable(action.chance) else action.chance):
+                    return
+
+            # Dispatch action execution
+            success = self._dispatch(action, user, target, battle_ctx, ctx, move)
+
+            # Recharge charge for the user per executed action IF it succeeded
+            recharge = ctx.charge_recharge  # read once: it may be a DSL value
+            if success and user and recharge > 0:
+                user.add_stat("charge", recharge*user.current_stats.charge_bonus)
 
         return success
 
@@ -89,15 +115,82 @@ class MoveEngine:
         result = handler.execute(self, action, user, target, battle_ctx, move_ctx, move)
         return False if result is False else True
 
-def merge_context(parent: MoveContext, obj) -> MoveContext:
-    base = parent.model_dump()
-    overrides = obj.model_dump(exclude_none=True)
-
-    for field in MoveContext.model_fields:
-        if field in overrides:
-            base[field] = overrides[field]
-
-    return MoveContext.model_validate(base)
+    # ------------------------------
+    # Profiling
+    # ------------------------------
+    def enable_profiling(self, dump_path: str | Path | None = None, dump_every: float = 60.0, *, profile: ExecutionProfile | None = None) -> ExecutionProfile:
+        """
+        Record calls, time, p99 and success rate per move id ("moves") and per
+        action id ("actions"); see ExecutionProfile for the periodic dump.
+        Handlers are wrapped while enabled, so control actions (repeat, random,
+        condition) run through their handlers and their times include their
+        sub-actions'. Disabled, execution goes through nothing extra.
+        profile: record into an existing profile instead (dump_path and
+        dump_every are then ignored), e.g. one shared across hot reloads.
+        """
+        if self.profile is not None:
+            self.disable_profiling()
+        profile = self.profile = profile or ExecutionProfile(dump_path, dump_every)
+        self._plain_handlers = self.action_handlers
+        self.action_handlers = {
+            action_id: _TimedHandler(handler, profile, profile.stats("actions", action_id))
+            for action_id, handler in self.action_handlers.items()
+        }
+        self._programs.clear()
+
+        execute_move = self._execute_move
+        def timed_execute_move(move_id: str, *args) -> bool:
+            start = time.perf_counter()
+            went_off = execute_move(move_id, *args)
+            end = time.perf_counter()
+            profile.record(profile.stats("moves", move_id), end - start, went_off, end)
+            return went_off
+        # shadows the method on this instance only
+        self._execute_move = timed_execute_move
+        return profile
+
+    def disable_profiling(self) -> ExecutionProfile | None:
+        """Stop recording; returns the profile (dumped a last time if it has a dump path)."""
+        profile, self.profile = self.profile, None
+        if profile is None:
+            return None
+        del self._execute_move
+        self.action_handlers = self._plain_handlers
+        self._programs.clear()
+        if profile.dump_path is not None:
+            profile.dump(profile.dump_path)
+        return profile
+
+class _TimedHandler:
+    """An action handler recording its calls into an ExecutionProfile."""
+    __slots__ = ("handler", "profile", "stats")
+
+    def __init__(self, handler: ActionHandler, profile: ExecutionProfile, stats: CallStats):
+        self.handler = handler
+        self.profile = profile
+        self.stats = stats
+
+    def execute(self, engine: MoveEngine, action: ActionBase, *args):
+        start = time.perf_counter()
+        result = self.handler.execute(engine, action, *args)
+        end = time.perf_counter()
+        self.profile.record(self.stats, end - start, result is not False, end)
+        return result
+
+# BRANLY_MOVE_PROFILE=<path> profiles move execution, dumped as JSON every
+# minute and on exit. Every engine created in the process (hot reloads make
+# new ones while running battles keep theirs) records into the same profile.
+_env_profile: ExecutionProfile | None = None
+
+def _shared_profile(dump_path: str) -> ExecutionProfile:
+    global _env_profile
+    if _env_profile is None:
+        _env_profile = ExecutionProfile(dump_path)
+        atexit.register(_env_profile.dump, dump_path)
+    return _env_profile
 
 def create_engine(moves_config : BaseModel, registry : SystemRegistry) -> MoveEngine:
-    return MoveEngine(set=moves_config, registry=registry, action_handlers=ACTION_HANDLERS)
+    engine = MoveEngine(set=moves_config, registry=registry, action_handlers=ACTION_HANDLERS)
+    if os.environ.get("BRANLY_MOVE_PROFILE"):
+        engine.enable_profiling(profile=_shared_profile(os.environ["BRANLY_MOVE_PROFILE"]))
+    return engine
@@ -1,17 +1,18 @@
 from __future__ import annotations
-import random
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from systems.battle.schema import FighterVolatile
     
-from pydantic import Field, RootModel, TypeAdapter, model_validator
-from typing import Annotated, Dict, Literal, Optional, Union
+from pydantic import Field, PrivateAttr, RootModel, TypeAdapter, model_validator
+from typing import Annotated, Any, Dict, Literal, Optional, Union
 from core.dsl.random_dsl import NUM, RBOOL, RINT, RNUM, RSTR, RVAL, check
+import json
 import re
 import warnings
 
 from core.dsl.resolvable import ResolvableModel
+from core.registry import current_registry
 from ..fighters.schema import FighterStats
 
 Stat = tuple(FighterStats().model_dump().keys())
@@ -51,6 +52,9 @@ class MoveContext(ResolvableModel):
     duration: RINT = -1
     charge_recharge: RINT = 33
 
+    # runtime overrides this context was layered with (see layered())
+    _runtime: dict | None = PrivateAttr(default=None)
+
     @property
     def is_percentage(self) -> bool:
         """Whether `amount` is meant to be a percentage."""
@@ -76,6 +80,28 @@ class MoveContext(ResolvableModel):
             return self.amount * self.get_calc_target_field_value(user, target)
         return self.amount
 
+    def merge(self, obj: ResolvableModel, validate: bool = False) -> MoveContext:
+        """
+        This context overridden by the context fields `obj` (a move or an
+        action) sets. Runtime merges are trusted: the contexts authored
+        content can produce are validated once, at load (Move.check_contexts).
+        """
+        overrides = _context_overrides(obj)
+        base = {field: self.__dict__[field] for field in CONTEXT_FIELDS}
+        base.update(overrides)
+        # with nothing overridden the result is the (valid) parent again
+        return MoveContext.model_validate(base) if validate and overrides else MoveContext.trusted(**base)
+
+    def layered(self, runtime: dict, overrides: dict | None = None) -> MoveContext:
+        """
+        This context with runtime overrides on top, themselves under `overrides`
+        (the fields set by the actions between the move and this context).
+        The result remembers `runtime` so child contexts can layer it too.
+        """
+        ctx = self.model_copy(update={**runtime, **overrides} if overrides else runtime)
+        ctx._runtime = runtime
+        return ctx
+
     @model_validator(mode="after")
     def check_context(self):
         check("amount >= 0", amount=self.amount)
@@ -100,6 +126,13 @@ class MoveContext(ResolvableModel):
             raise ValueError("MoveContext 'amount' and 'flat' cannot sum to negative.")
         return self
 
+CONTEXT_FIELDS = tuple(MoveContext.model_fields)
+
+def _context_overrides(obj: ResolvableModel) -> dict:
+    """Context fields set (not None) on a move or action, extras included."""
+    values = {**obj.__dict__, **(obj.__pydantic_extra__ or {})}
+    return {field: values[field] for field in CONTEXT_FIELDS if values.get(field) is not None}
+
 # ------------------------------
 # ActionBase
 # ------------------------------
@@ -127,6 +160,22 @@ class ActionBase(ResolvableModel):
             values[k] = adapter.validate_python(v)
         return values
 
+    # set at load by Move.check_contexts: the context the action runs with,
+    # and the context fields set by it and the actions above it
+    _context: MoveContext | None = PrivateAttr(default=None)
+    _overrides: dict | None = PrivateAttr(default=None)
+
+    @property
+    def sub_actions(self) -> list[ActionBase]:
+        """Actions this one runs, with its context as their parent."""
+        return []
+
+    def context(self, parent: MoveContext) -> MoveContext:
+        """The context this action runs with under `parent`, its parent's context."""
+        if parent._runtime is None:
+            return self._context
+        return self._context.layered(parent._runtime, self._overrides)
+
     @property
     def params(self) -> dict:
         return {k: v for k, v in self.model_dump(exclude_none=True).items() if k != "id"}
@@ -147,10 +196,9 @@ class DamageAction(ActionBase):
         check("0 <= piercing <= 1", piercing=self.piercing)
         return self
     
-    @property
-    def is_critical(self) -> bool:
+    def is_critical(self, rng) -> bool:
         """Determine if the hit is a critical hit based on crit_chance."""
-        return random.random() < self.crit_chance
+        return rng.random() < self.crit_chance
     
 class BuffAction(ActionBase):
     id: Literal["buff"]
@@ -174,6 +222,8 @@ class ShieldAction(ActionBase):
 class HealAction(ActionBase):
     id: Literal["heal"]
 
+FIELD_PATH = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+
 class ModifyAction(ActionBase):
     id: Literal["modify"]
     field: RSTR
@@ -181,15 +231,8 @@ class ModifyAction(ActionBase):
 
     @model_validator(mode="after")
     def check_modify(self):
-        pattern = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*$")
-        try:
-            check(
-                "re.fullmatch(pattern, field) is not None",
-                field=self.field,
-                pattern=pattern,
-                re=re,  # pass re module explicitly
-            )
-        except ValueError:
+        field = self.field
+        if not isinstance(field, str) or FIELD_PATH.fullmatch(field) is None:
             raise ValueError("field must be a dot-path of identifiers (e.g. 'foo.bar_baz')")
         return self
 
@@ -198,38 +241,36 @@ class TextAction(ActionBase):
     text: RSTR = "No text."
     style: RSTR = "{}"
 
-@model_validator(mode="after")
-def check_text(self):
-    check("len(text) < 511", text=self.text)
+    @model_validator(mode="after")
+    def check_text(self):
+        try:
+            check("len(text) < 511", text=self.text)
+        except ValueError:
+            raise ValueError("TextAction 'text' must be shorter than 511 characters.")
 
-    try:
-        check("style.startswith('{') and style.endswith('}')", style=self.style)
-    except ValueError:
-        raise ValueError(
-            "TextAction 'style' must be a dict-like string "
-            "(e.g. '{\"color\":\"red\",\"bold\":true}')"
-        )
+        flags = _style_flags(self.style)
+        if flags is None:
+            raise ValueError(
+                "TextAction 'style' must be a dict-like string "
+                "(e.g. '{\"color\":\"red\",\"bold\":true}')"
+            )
+        if "color" in flags:
+            try:
+                check("color in colors", color=flags["color"], colors=COLOR)
+            except ValueError:
+                raise ValueError("TextAction 'style' contains invalid color flags.")
+        if any(k not in STYLE or not isinstance(v, bool) for k, v in flags.items() if k != "color"):
+            raise ValueError("TextAction 'style' contains invalid style flags.")
+        return self
 
+def _style_flags(style: Any) -> dict | None:
+    """The flags of a dict-like style string (single quotes allowed), None if it isn't one."""
     try:
-        check("json.loads(style.replace(\"'\", '\"')).get('color') in color", 
-              style=self.style, color=COLOR)
-    except ValueError:
-        raise ValueError(
-            "TextAction 'style' contains invalid color flags."
-        )
+        flags = json.loads(style.replace("'", '"'))
+    except (AttributeError, json.JSONDecodeError):
+        return None
+    return flags if isinstance(flags, dict) else None
 
-    try:
-        check(
-            "all(k in styles and isinstance(v, bool) "
-            "for k,v in json.loads(style.replace(\"'\", '\"')).items() if k != 'color')", 
-            style=self.style, styles=STYLE)
-    except ValueError:
-        raise ValueError(
-            "TextAction 'style' contains invalid style flags."
-        )
-
-    return self
-    
 # ------------------------------
 # Status / Condition
 # ------------------------------
@@ -279,6 +320,10 @@ class ConditionAction(ActionBase):
     conditions: list[Condition]
     actions: list[Action]
 
+    @property
+    def sub_actions(self) -> list[ActionBase]:
+        return self.actions
+
     @model_validator(mode="after")
     def check_condition(self):
         if not self.conditions:
@@ -304,6 +349,10 @@ class RandomAction(ActionBase):
     id: Literal["random"]
     choices: list[RandomChoice]
 
+    @property
+    def sub_actions(self) -> list[ActionBase]:
+        return [c.action for c in self.choices]
+
     @model_validator(mode="after")
     def check_random(self):
         if not self.choices:
@@ -322,6 +371,10 @@ class RepeatAction(ActionBase):
     actions: list[Action]
     count: RINT = 1
 
+    @property
+    def sub_actions(self) -> list[ActionBase]:
+        return self.actions
+
     @model_validator(mode="after")
     def check_repeat(self):
         check("count >= 0", count=self.count)
@@ -369,14 +422,18 @@ class Move(MoveContext):
 
     actions: list[Action] = Field(default_factory=list)
 
+    # set at load by check_contexts: the context the move's actions run under
+    _context: MoveContext | None = PrivateAttr(default=None)
+
     def is_stab(self, user: FighterVolatile) -> bool:
         """Whether the move gets STAB for the user."""
         return self.type == user.current_fighter.type
 
     def type_effectiveness(self, user: FighterVolatile, target: FighterVolatile) -> float:
-        """Calculate type effectiveness multiplier."""
-        # Placeholder for type effectiveness calculation TODO take this into account
-        return 1.0
+        """Multiplier of the move's type against the target's type (data/types.json)."""
+        effectiveness = current_registry().get("types").effectiveness(self.type, target.current_fighter.type)
+        # None when the types system is left out of the registry profile (NullEngine)
+        return 1.0 if effectiveness is None else effectiveness
 
     def get_effective_amount(self, user: FighterVolatile, target: FighterVolatile, move_ctx: MoveContext | None = None) -> NUM:
         """The actual amount to apply after considering bonuses."""
@@ -419,6 +476,27 @@ class Move(MoveContext):
             raise ValueError(f"Invalid move charge usage: {self.charge_usage}")
         return self
 
+    @model_validator(mode="after")
+    def check_contexts(self):
+        """
+        Validate the context each action runs with and keep it on the action,
+        so the engine only layers runtime overrides on top.
+        """
+        def walk(parent: MoveContext, inherited: dict, actions: list[ActionBase]):
+            for action in actions:
+                action._context = parent.merge(action, validate=True)
+                action._overrides = {**inherited, **_context_overrides(action)}
+                walk(action._context, action._overrides, action.sub_actions)
+        self._context = MoveContext.trusted().merge(self)
+        walk(self._context, {}, self.actions)
+        return self
+
+    def context(self, runtime_ctx: MoveContext | None = None) -> MoveContext:
+        """The context the move's actions run under, with runtime overrides if any."""
+        if runtime_ctx is None:
+            return self._context
+        return self._context.layered({field: runtime_ctx.__dict__[field] for field in CONTEXT_FIELDS})
+
 class MoveSet(RootModel[list[Move]]):
     """
     Root model for a list of Move instances.
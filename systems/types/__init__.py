@@ -0,0 +1,13 @@
+from core.registry import registry, SystemSpec
+from .schema import TypeChart
+from .engine import create_engine as create_types
+
+DATA_FILE = "types.json"
+
+SPEC = SystemSpec(
+    name="types",
+    schema=TypeChart,
+    engine_factory=create_types,
+    data_file=DATA_FILE
+)
+registry.add_spec(SPEC)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from .schema import TypeChart
+    from core.registry import SystemRegistry
+
+
+class TypeEngine:
+    """
+    The type chart as a dense matrix: types are interned to ids (their index
+    in chart.types) and matrix[attack_id][target_id] is the multiplier.
+    """
+    def __init__(self, chart: TypeChart, registry: SystemRegistry):
+        self.chart = chart
+        self.registry = registry
+        self.index: dict[str, int] = {t: i for i, t in enumerate(chart.types)}
+        self.matrix: tuple[tuple[float, ...], ...] = tuple(tuple(chart.chart[t]) for t in chart.types)
+        self._array = None
+
+    def id(self, type: str) -> int:
+        return self.index[type]
+
+    def ids(self, types: Iterable[str]) -> list[int]:
+        """Type ids of many types at once, e.g. to index array()."""
+        index = self.index
+        return [index[t] for t in types]
+
+    def effectiveness(self, attack: str, target: str) -> float:
+        """Multiplier of an `attack`-type move against a `target`-type fighter; 1.0 for types not in the chart."""
+        i = self.index.get(attack)
+        j = self.index.get(target)
+        if i is None or j is None:
+            return 1.0
+        return self.matrix[i][j]
+
+    def array(self):
+        """
+        The matrix as a read-only numpy array, for applying effectiveness
+        over many matchups at once: array()[ids(attacks), ids(targets)].
+        Needs numpy, an optional dependency (requirements-analysis.txt).
+        """
+        if self._array is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError("TypeEngine.array needs numpy (pip install -r requirements-analysis.txt)") from None
+            array = np.array(self.matrix, dtype=float)
+            array.flags.writeable = False
+            self._array = array
+        return self._array
+
+def create_engine(type_chart : BaseModel, registry : SystemRegistry) -> TypeEngine:
+    return TypeEngine(chart=type_chart, registry=registry)
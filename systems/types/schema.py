@@ -0,0 +1,28 @@
+from __future__ import annotations
+from pydantic import BaseModel, model_validator
+
+# ------------------------------
+# Type Chart
+# ------------------------------
+class TypeChart(BaseModel):
+    """
+    Damage multipliers between combat types (see docs/type_table.md).
+    chart[attack][i]: multiplier of an `attack` move against a fighter of
+    type types[i].
+    """
+    version: str = "1.0"
+    types: list[str]
+    chart: dict[str, list[float]]
+
+    @model_validator(mode="after")
+    def check_chart(self):
+        if len(set(self.types)) != len(self.types):
+            raise ValueError(f"Duplicate types in type chart: {self.types}")
+        if set(self.chart) != set(self.types):
+            raise ValueError(f"Type chart rows {sorted(self.chart)} don't match types {sorted(self.types)}")
+        for attack, row in self.chart.items():
+            if len(row) != len(self.types):
+                raise ValueError(f"Type chart row '{attack}' has {len(row)} multipliers, expected {len(self.types)}")
+            if any(m < 0 for m in row):
+                raise ValueError(f"Type chart row '{attack}' has a negative multiplier")
+        return self
@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+import shutil
+
+import pytest
+
+# Tests never open a window nor read or write the user's snapshot cache.
+os.environ.setdefault("BRANLY_HEADLESS", "1")
+os.environ.setdefault("BRANLY_SNAPSHOTS", "0")
+
+# Standalone scripts, not pytest modules.
+collect_ignore = ["test_move.py", "damage_formula.py"]
+
+
+@pytest.fixture
+def data_root(tmp_path: Path) -> Path:
+    """A writable copy of the shipped data directory."""
+    from core.registry import DATA_ROOT
+    root = tmp_path / "data"
+    shutil.copytree(DATA_ROOT, root, ignore=shutil.ignore_patterns(".snapshots"))
+    return root
@@ -0,0 +1,68 @@
+import json
+import threading
+
+import pytest
+from pydantic import BaseModel
+
+from core import registry as registry_module
+from core.registry import DATA_ROOT, SystemRegistry, SystemSpec, registry
+
+
+class Config(BaseModel):
+    value: int = 0
+
+class Engine:
+    def __init__(self, config, reg):
+        self.config = config
+        self.thread = threading.current_thread()
+        # dependencies are built before their dependents
+        self.deps = {name: reg._systems[name] for name in reg.spec(f"s{config.value}").depends_on}
+
+def toy_registry(tmp_path, specs: dict[str, dict]) -> SystemRegistry:
+    reg = SystemRegistry(tmp_path, snapshot_dir=None)
+    for name, options in specs.items():
+        (tmp_path / f"{name}.json").write_text(json.dumps({"value": int(name[1:])}))
+        reg.add_spec(SystemSpec(name=name, schema=Config, engine_factory=Engine, data_file=f"{name}.json", **options))
+    return reg
+
+
+def test_build_order_puts_dependencies_first(tmp_path):
+    reg = toy_registry(tmp_path, {"s1": {"depends_on": ("s2", "s3")}, "s2": {"depends_on": ("s3",)}, "s3": {}})
+    assert reg.build_order(["s1"]) == ["s3", "s2", "s1"]
+    reg.build_all()
+    assert set(reg.get("s1").deps) == {"s2", "s3"}
+
+def test_dependency_cycle_raises(tmp_path):
+    reg = toy_registry(tmp_path, {"s1": {"depends_on": ("s2",)}, "s2": {"depends_on": ("s3",)}, "s3": {"depends_on": ("s1",)}})
+    with pytest.raises(ValueError, match="Dependency cycle between systems: s1 -> s2 -> s3 -> s1"):
+        reg.build_all()
+    # checked before anything is built
+    assert not reg._systems
+
+def test_unknown_dependency_raises(tmp_path):
+    reg = toy_registry(tmp_path, {"s1": {"depends_on": ("s9",)}})
+    with pytest.raises(ValueError, match="System 's1' depends on unregistered system 's9'"):
+        reg.build_all()
+    with pytest.raises(ValueError, match="System 's9' not registered"):
+        reg.build_order(["s9"])
+
+def test_main_thread_systems_build_on_the_calling_thread(tmp_path):
+    reg = toy_registry(tmp_path, {"s1": {"main_thread": True}, "s2": {"depends_on": ("s1",)}, "s3": {}, "s4": {"main_thread": True, "depends_on": ("s3",)}})
+    reg.build_all(max_workers=2)
+    main = threading.current_thread()
+    assert reg.get("s1").thread is main and reg.get("s4").thread is main
+    assert reg.get("s2").thread is not main and reg.get("s3").thread is not main
+
+def test_threaded_build_matches_serial_builds(monkeypatch):
+    # validate again rather than share the configs of the singleton
+    monkeypatch.setattr(registry_module, "_shared_configs", registry_module.weakref.WeakValueDictionary())
+    threaded = registry.derive(DATA_ROOT, snapshot_dir=None)
+    threaded.build_all(max_workers=4)
+    monkeypatch.setattr(registry_module, "_shared_configs", registry_module.weakref.WeakValueDictionary())
+    serial = registry.derive(DATA_ROOT, snapshot_dir=None)
+    for name in serial.build_order(threaded._configs):
+        serial.build(name)
+    assert threaded._configs.keys() == serial._configs.keys()
+    for name, config in threaded._configs.items():
+        assert config is not serial._configs[name]
+        assert repr(config.model_dump()) == repr(serial._configs[name].model_dump()), name
@@ -0,0 +1,104 @@
+from contextlib import nullcontext
+
+import pytest
+
+from core.dsl.resolvable import per_action_resolution
+from core.registry import registry
+from core.rng import use_rng
+from systems.battle.schema import Battle
+from systems.moves.compiler import CALL, JOIN, LOOP, RANDOM, REPEAT, CONDITION
+from systems.moves.engine import MoveEngine
+from systems.moves.handlers import ACTION_HANDLERS
+from systems.moves.schema import Move, MoveContext, MoveSet
+
+# Exercises every control opcode, nested: a condition holding a repeat
+# with a random count, a random whose branches are a gated leaf and a
+# repeat, and a repeat that may run zero times.
+NESTED = {
+    "id": "nested", "amount": 10, "chance": 0.9, "charge_recharge": 3, "actions": [
+        {"id": "condition", "conditions": [{"id": "hp_below", "value": "r[1, 9]"}], "chance": 0.8, "actions": [
+            {"id": "damage", "amount": 5},
+            {"id": "repeat", "count": "l[0, 1, 2, 3]", "charge_recharge": 5, "actions": [
+                {"id": "heal", "chance": 0.5},
+                {"id": "text", "text": "hi"},
+            ]},
+        ]},
+        {"id": "random", "choices": [
+            {"action": {"id": "damage", "chance": 0.3, "amount": "r[5, 15]"}, "weight": "l[0, 2]"},
+            {"action": {"id": "repeat", "count": 2, "actions": [{"id": "damage"}, {"id": "buff", "stat": "attack", "amount": 2, "duration": 2}]}, "weight": 1},
+        ]},
+        {"id": "repeat", "count": "r[0, 3]", "actions": [
+            {"id": "random", "choices": [
+                {"action": {"id": "shield", "amount": "l[1, 2]"}, "weight": 1},
+                {"action": {"id": "text", "text": "x"}, "weight": 1},
+            ]},
+        ]},
+    ],
+}
+
+def tree_execute(engine: MoveEngine, move_id: str, user, target, battle_ctx, runtime_ctx):
+    """MoveEngine._execute_move, walking the action tree through _execute_action."""
+    move = engine.set[move_id]
+    with use_rng(battle_ctx.rng):
+        charge_usage = move.charge_usage
+        if charge_usage > user.current_stats.charge:
+            return
+        user.current_stats.charge -= charge_usage
+        if battle_ctx.rng.random() > move.chance:
+            return
+        ctx = move.context(runtime_ctx)
+        for action in move.actions:
+            engine._execute_action(action, user, target, battle_ctx, ctx, move)
+
+def state(fighter) -> tuple:
+    return (fighter.current_fighter.model_dump(), [b.model_dump() for b in fighter.current_buffs], [s.model_dump() for s in fighter.current_status])
+
+def play(moves: MoveSet, move_id: str, compiled: bool, runtime_ctx, resolution, rounds: int = 25) -> list:
+    engine = MoveEngine(set=moves, registry=registry, action_handlers=ACTION_HANDLERS)
+    fighters = list(registry.get("fighters").set.keys())
+    battle = Battle.from_sides("parity", [[fighters[0]], [fighters[-1]]], seed=7)
+    ctx = battle.current_context
+    user, target = ctx.sides[0][0], ctx.sides[1][0]
+    trace = []
+    with resolution():
+        for _ in range(rounds):
+            user.current_stats.charge = 999
+            target.current_stats.hp = target.current_fighter.stats.hp or 1
+            if compiled:
+                engine.execute(move_id, user, target, ctx, runtime_ctx)
+            else:
+                tree_execute(engine, move_id, user, target, ctx, runtime_ctx)
+            trace.append(([event.to_dict() for event in ctx.events.drain()], state(user), state(target)))
+    return trace
+
+RUNTIME = {"none": None, "override": MoveContext(mult=1.5, amount="r[0.1, 0.3]", charge_recharge=10)}
+RESOLUTION = {"read": nullcontext, "action": per_action_resolution}
+
+@pytest.fixture(scope="module")
+def shipped():
+    return registry.get("moves").set
+
+@pytest.mark.parametrize("resolution", RESOLUTION)
+@pytest.mark.parametrize("runtime", RUNTIME)
+def test_shipped_moves(shipped, runtime, resolution):
+    for move_id in shipped.keys():
+        compiled = play(shipped, move_id, True, RUNTIME[runtime], RESOLUTION[resolution])
+        walked = play(shipped, move_id, False, RUNTIME[runtime], RESOLUTION[resolution])
+        assert compiled == walked, move_id
+
+@pytest.mark.parametrize("resolution", RESOLUTION)
+@pytest.mark.parametrize("runtime", RUNTIME)
+def test_nested_control_actions(runtime, resolution):
+    moves = MoveSet.model_validate([Move.model_validate(NESTED)])
+    compiled = play(moves, "nested", True, RUNTIME[runtime], RESOLUTION[resolution], rounds=200)
+    walked = play(moves, "nested", False, RUNTIME[runtime], RESOLUTION[resolution], rounds=200)
+    assert compiled == walked
+
+def test_nested_program_layout():
+    moves = MoveSet.model_validate([Move.model_validate(NESTED)])
+    engine = MoveEngine(set=moves, registry=registry, action_handlers=ACTION_HANDLERS)
+    ops = [ins[0] for ins in engine.program(moves["nested"]).code]
+    assert {CALL, REPEAT, LOOP, RANDOM, JOIN, CONDITION} <= set(ops)
+    # every frame opened is closed by its matching instruction
+    assert ops.count(REPEAT) == ops.count(LOOP) == 3
+    assert ops.count(JOIN) == 4
@@ -0,0 +1,59 @@
+import pytest
+
+from core.registry import registry
+from systems.moves.schema import CONTEXT_FIELDS, Move, MoveContext
+
+NESTED = {"id": "t", "mult": 2.0, "actions": [
+    {"id": "repeat", "count": 2, "flat": 3, "actions": [
+        {"id": "damage", "amount": 4},
+        {"id": "random", "choices": [{"action": {"id": "heal", "calc_field": "attack"}, "weight": 1}]},
+    ]},
+    {"id": "condition", "conditions": [{"id": "hp_below", "value": 50}], "actions": [{"id": "shield"}]},
+]}
+RUNTIME = (None, MoveContext(mult=1.5, amount="r[0.1, 0.3]", charge_recharge=10))
+
+
+def fields(ctx: MoveContext) -> dict:
+    """Stored (unsampled) context values."""
+    return {field: ctx.__dict__[field] for field in CONTEXT_FIELDS}
+
+def walk(action, parent: MoveContext, legacy: MoveContext):
+    """(precomputed, merged) contexts of an action and the actions under it."""
+    ctx, merged = action.context(parent), legacy.merge(action)
+    yield fields(ctx), fields(merged)
+    for sub_action in action.sub_actions:
+        yield from walk(sub_action, ctx, merged)
+
+def pairs(move: Move, runtime_ctx: MoveContext | None):
+    exec_ctx = move.context(runtime_ctx)
+    # the merge path contexts were built with before they were precomputed
+    legacy = MoveContext.trusted().merge(move)
+    if runtime_ctx is not None:
+        legacy = legacy.model_copy(update=runtime_ctx.model_dump())
+    yield fields(exec_ctx), fields(legacy)
+    for action in move.actions:
+        yield from walk(action, exec_ctx, legacy)
+
+@pytest.mark.parametrize("runtime_ctx", RUNTIME, ids=("no override", "runtime override"))
+def test_nested_move_matches_merge_path(runtime_ctx):
+    move = Move.model_validate(NESTED)
+    compared = list(pairs(move, runtime_ctx))
+    assert len(compared) == 7
+    for precomputed, merged in compared:
+        assert precomputed == merged
+
+@pytest.mark.parametrize("runtime_ctx", RUNTIME, ids=("no override", "runtime override"))
+def test_loaded_moves_match_merge_path(runtime_ctx):
+    for move in registry.get("moves").set.values():
+        for precomputed, merged in pairs(move, runtime_ctx):
+            assert precomputed == merged, move.id
+
+def test_contexts_are_shared_without_runtime_overrides():
+    move = Move.model_validate(NESTED)
+    repeat = move.actions[0]
+    assert move.context() is move._context
+    assert repeat.context(move.context()) is repeat._context
+    assert repeat.actions[0]._overrides == {"flat": 3, "amount": 4}
+    # runtime overrides sit under the fields set along the action chain
+    ctx = repeat.actions[0].context(repeat.context(move.context(MoveContext(flat=9, mult=0.5))))
+    assert (ctx.flat, ctx.mult, ctx.amount) == (3, 0.5, 4)
@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from core.dsl.nodes import Rounded
+from core.dsl.random_dsl import distribution, parse_dsl, sample_n
+
+np = pytest.importorskip("numpy")
+
+N = 200_000
+CONTINUOUS = ("r[2, 8]", "r[l[1, 2], r[5, 9]]", "l[1, r[2, 4]]", "wl[(r[0, 10], 3), (20, 1)]")
+DISCRETE = ("l[1, 2, 2, 5]", "wl[(1, 2), (3, 1), (7, 0)]", "l[wl[(1, 1), (4, 3)], l[2, 4]]")
+ROUNDED = ("r[0, 10]", "r[l[0, 2], 5]", "l[r[0.2, 1.7], 3]")
+
+
+def check_moments(dist, values):
+    assert dist.numeric
+    # the sample mean is within ~4 standard errors, the variance within a few percent
+    assert abs(values.mean() - dist.mean) < 4 * math.sqrt(dist.variance / N) + 1e-9
+    assert values.var() == pytest.approx(dist.variance, rel=0.03, abs=1e-9)
+    assert dist.min <= values.min() and values.max() <= dist.max
+
+def check_pmf(pmf, values):
+    assert sum(pmf.values()) == pytest.approx(1.0)
+    assert set(np.unique(values).tolist()) <= {v for v, p in pmf.items() if p > 0}
+    for v, p in pmf.items():
+        assert np.count_nonzero(values == v) / N == pytest.approx(p, abs=0.01)
+
+@pytest.mark.parametrize("expr", CONTINUOUS)
+def test_continuous_moments_match_sampling(expr):
+    node = parse_dsl(expr)
+    check_moments(distribution(node), sample_n(node, N, rng=1))
+
+@pytest.mark.parametrize("expr", DISCRETE)
+def test_discrete_pmf_matches_sampling(expr):
+    node = parse_dsl(expr)
+    dist, values = distribution(node), sample_n(node, N, rng=2)
+    check_moments(dist, values)
+    check_pmf(dist.pmf, values)
+
+@pytest.mark.parametrize("expr", ROUNDED)
+def test_rounded_pmf_matches_sampling(expr):
+    node = Rounded(parse_dsl(expr))
+    dist, values = distribution(node), sample_n(node, N, rng=3)
+    assert dist.exact
+    check_moments(dist, values)
+    check_pmf(dist.pmf, values)
+
+def test_closed_forms():
+    assert distribution(parse_dsl("l[1, r[2, 4]]")).mean == 2.0
+    assert distribution(parse_dsl("r[2, 8]")).variance == pytest.approx(36 / 12)
+    assert distribution(parse_dsl("wl[(1, 3), (5, 1)]")).pmf == {1: 0.75, 5: 0.25}
+    assert distribution(Rounded(parse_dsl("r[0, 2]"))).pmf == {0: 0.25, 1: 0.5, 2: 0.25}
+    assert distribution(7).pmf == {7: 1.0}
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from core.dsl import random_dsl
+from core.dsl.random_dsl import PARSE_CACHE_SIZE, make_dsl, parse_dsl
+
+
+def test_equal_expressions_share_one_node():
+    assert parse_dsl("r[1, 2]") is parse_dsl("r[1,2]") is parse_dsl("  r[ 1 ,2 ] ")
+    assert parse_dsl("wl[(r[1,2], 3), (4, 1)]") is parse_dsl("wl[( r[1, 2] , 3 ),(4,1)]")
+    assert parse_dsl("r[1, 2]") is not parse_dsl("r[1, 3]")
+
+def test_sub_expressions_are_shared():
+    outer = parse_dsl("l[r[10, 20], 5]")
+    assert outer.choices[0] is parse_dsl("r[10,20]")
+    assert parse_dsl("l[l[r[10, 20], 5], 30]").choices[0] is outer
+
+def test_json_lists_share_one_node():
+    assert make_dsl(["r[1, 2]", 3]) is make_dsl(["r[1,2]", 3])
+    assert make_dsl(["r[1, 2]", 3]).choices[0] is parse_dsl("r[1,2]")
+    assert make_dsl([1, 2]) is not make_dsl([1, 3])
+
+def test_sampled_expressions_are_not_cached():
+    assert "v:r[1, 2]" not in random_dsl._interned
+    parse_dsl("v:r[1, 2]")
+    assert "v:r[1, 2]" not in random_dsl._interned
+
+def test_cache_is_bounded():
+    for i in range(PARSE_CACHE_SIZE + 10):
+        parse_dsl(f"r[{i}, {i + 1}]")
+    assert len(random_dsl._interned) <= PARSE_CACHE_SIZE
+    # evicted expressions parse again to an equal node
+    assert parse_dsl("r[0, 1]").source == "r[0,1]"
+
+def test_concurrent_parsing_and_eviction(monkeypatch):
+    # a tiny cache so threads keep evicting each other's entries
+    monkeypatch.setattr(random_dsl, "PARSE_CACHE_SIZE", 8)
+    start = threading.Barrier(8)
+
+    def parse(worker):
+        start.wait()
+        return [parse_dsl(f"l[r[{i}, {i + 1}], {worker % 2}]") for i in range(300)]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(parse, range(8)))
+    assert len(random_dsl._interned) <= 8
+    for worker, nodes in enumerate(results):
+        assert [n.source for n in nodes] == [n.source for n in results[worker % 2]]
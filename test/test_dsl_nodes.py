@@ -0,0 +1,37 @@
+import pickle
+import random
+
+from core.dsl.nodes import Choice, Const, DSLNode, Range, Rounded, WeightedChoice
+from core.dsl.random_dsl import get_domain, parse_dsl
+
+
+def test_nodes_are_slotted():
+    for node in (parse_dsl("r[1, 2]"), parse_dsl("l[1, r[2, 3]]"), parse_dsl("wl[(1, 2), (3, 1)]"), Const(4), Rounded(parse_dsl("r[1, 2]"))):
+        assert isinstance(node, DSLNode)
+        assert not hasattr(node, "__dict__")
+
+def test_parsed_node_types_and_domains():
+    assert isinstance(parse_dsl("r[1, 2]"), Range)
+    assert isinstance(parse_dsl("l[1, 2]"), Choice)
+    assert isinstance(parse_dsl("wl[(1, 2), (3, 1)]"), WeightedChoice)
+    assert parse_dsl("r[1, 2]").domain == (1, 2)
+    assert parse_dsl("l[1, 2, 2]").domain == {1, 2}
+    assert parse_dsl("l[1, r[2, 3]]").domain == {1, (2, 3)}
+    assert get_domain(parse_dsl("r[l[1, 2], 5]")) == (1, 5)
+
+def test_samples_stay_in_domain():
+    rng = random.Random(0)
+    lo, hi = parse_dsl("r[l[1, 2], 5]").domain
+    assert all(lo <= parse_dsl("r[l[1, 2], 5]").sample(rng) <= hi for _ in range(500))
+    choice = parse_dsl("wl[(1, 2), (3, 1), (7, 0)]")
+    assert {choice.sample(rng) for _ in range(500)} == {1, 3}
+    assert {Rounded(parse_dsl("r[0.6, 2.4]")).sample(rng) for _ in range(500)} <= {1, 2}
+
+def test_pickle_round_trip():
+    outer = parse_dsl("l[r[10, 20], wl[(r[10, 20], 2), (5, 1)]]")
+    copy = pickle.loads(pickle.dumps(outer))
+    assert type(copy) is Choice and copy.source == outer.source and copy.domain == outer.domain
+    # a node shared inside one expression stays shared in the copy
+    assert copy.choices[0] is copy.choices[1].choices[0]
+    a, b = random.Random(3), random.Random(3)
+    assert [copy.sample(a) for _ in range(20)] == [outer.sample(b) for _ in range(20)]
@@ -0,0 +1,35 @@
+import pytest
+
+from core.dsl.random_dsl import DSLSyntaxError, parse_dsl
+
+
+@pytest.mark.parametrize("expr, column, message", [
+    ("r[1,2", 2, "Unclosed '['"),
+    ("l[1, r[2, 3]", 2, "Unclosed '['"),
+    ("l[1,2]]", 7, "Unexpected ']'"),
+    ("l[1, 2)", 7, "List must end with ']'"),
+    ("l[]", 2, "List cannot be empty"),
+    ("r[1,2,3]", 2, "Range must have exactly 2"),
+    ("wl[1, (2,3)]", 4, "Weighted list item must be a 2-tuple"),
+    ("wl[(1,2,3)]", 4, "Weighted list item must be a 2-tuple"),
+    ("wl[(1, x), (2, 3)]", 8, "Invalid weight 'x'"),
+    # columns count in the stripped expression
+    ("  l[1, 2]]", 8, "Unexpected ']'"),
+])
+def test_error_column(expr, column, message):
+    with pytest.raises(DSLSyntaxError) as e:
+        parse_dsl(expr)
+    assert e.value.column == column
+    assert str(e.value).startswith(f"{message}")
+    assert e.value.source == expr.strip()
+
+def test_is_a_value_error():
+    # schemas turn it into a pydantic validation error
+    assert issubclass(DSLSyntaxError, ValueError)
+
+def test_deep_nesting_parses():
+    depth = 500
+    node = parse_dsl("l[" * depth + "1, 2" + "]" * depth)
+    for _ in range(depth - 1):
+        node = node.choices[0]
+    assert node.source == "l[1,2]"
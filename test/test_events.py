@@ -0,0 +1,95 @@
+import pytest
+
+from systems.battle import events as ev
+from systems.battle.events import EventLog, Verbosity
+from systems.battle.schema import Battle
+from systems.moves.engine import MoveEngine
+from systems.moves.handlers import ACTION_HANDLERS
+from systems.moves.schema import Move, MoveSet
+
+TEXTS = [
+    (ev.BattleStarted(), "Battle started!"),
+    (ev.BattleEnded(), "Battle ended!"),
+    (ev.BattleOver("defeated"), "All opponents defeated!"),
+    (ev.BattleOver("max_turns"), "Maximum turns reached!"),
+    (ev.ModeSet("auto"), "Battle mode set to: auto"),
+    (ev.TurnStarted(3), "--- Turn 3 begins ---"),
+    (ev.MoveUsed("Ada", "Hotfix", "Bob"), "Ada uses Hotfix on Bob!"),
+    (ev.NoMoves("Ada"), "Ada has no moves!"),
+    (ev.NotEnoughCharge("Ada", "Hotfix", 50, 20), "Ada does not have enough charge to use Hotfix. Required: 50, Available: 20"),
+    (ev.LacksCharge("Ada"), "Ada lacks charge."),
+    (ev.ActionFailed("Ada", "damage"), "Ada Failed to deal damage"),
+    (ev.ActionFailed("Ada", "heal"), "Ada Failed to heal"),
+    (ev.Crit("Bob"), "Critical Hit!"),
+    (ev.Damage("Bob", 12), "Bob takes 12 damage"),
+    (ev.Heal("Bob", 12), "Bob is healed for 12 HP"),
+    (ev.Shield("Bob", 12), "Bob is shielded for 12 HP"),
+    (ev.BuffApplied("Bob", "attack", 10, 2), "Bob gains 10 attack for 2 turn(s)"),
+    (ev.BuffApplied("Bob", "attack", -10, 2), "Bob loses -10 attack for 2 turn(s)"),
+    (ev.BuffExpired("Bob", "attack"), "Bob's attack buff expired"),
+    (ev.StatModified("Bob", "hp", 5), "Bob's hp is modified to 5"),
+    (ev.StatusApplied("Bob", "poison", 3), "Applying status 'poison' to Bob for 3 turns !"),
+    (ev.StatusRemoved("Bob"), "Removing status from Bob !"),
+    (ev.TextShown("hello", "red"), "Writing text 'hello' with style 'red'"),
+    (ev.ConditionEvaluated("hp_below", 50), "Evaluating condition 'hp_below' with value '50'"),
+]
+
+
+@pytest.mark.parametrize("event, text", TEXTS, ids=[f"{e.kind}-{i}" for i, (e, _) in enumerate(TEXTS)])
+def test_event_text(event, text):
+    assert event.text() == str(event) == text
+    assert event.to_dict()["kind"] == type(event).__name__
+
+def test_every_event_has_a_text_case():
+    kinds = {cls for cls in vars(ev).values() if isinstance(cls, type) and issubclass(cls, ev.Event) and cls is not ev.Event}
+    assert kinds == {type(event) for event, _ in TEXTS}
+
+@pytest.mark.parametrize("verbosity, kept", [
+    (Verbosity.OFF, []),
+    (Verbosity.INFO, ["Damage"]),
+    (Verbosity.DEBUG, ["Damage", "ConditionEvaluated"]),
+])
+def test_verbosity_filters_events(verbosity, kept):
+    log = EventLog(verbosity)
+    log.emit(ev.Damage, "Bob", 3)
+    log.emit(ev.ConditionEvaluated, "hp_below", 50)
+    assert [e.kind for e in log.drain()] == kept
+    assert log.enabled(ev.Damage) == (verbosity >= Verbosity.INFO)
+    assert log.enabled(ev.ConditionEvaluated) == (verbosity >= Verbosity.DEBUG)
+
+def test_drain_moves_pending_to_history():
+    log = EventLog()
+    log.emit(ev.TurnStarted, 1)
+    log.emit(ev.Damage, "Bob", 3)
+    assert len(log) == 2
+    first = log.drain()
+    assert [e.to_dict() for e in first] == [{"kind": "TurnStarted", "turn": 1}, {"kind": "Damage", "target": "Bob", "amount": 3}]
+    assert len(log) == 0 and log.drain() == []
+    log.emit(ev.Heal, "Bob", 1)
+    assert log.history == first
+    assert log.drain() == [ev.Heal("Bob", 1)]
+    assert log.history == first + [ev.Heal("Bob", 1)]
+
+def test_context_log_compatibility():
+    ctx = Battle.from_sides("events", [["fighter_001"], ["fighter_002"]], seed=0).current_context
+    ctx.events.emit(ev.TurnStarted, 1)
+    ctx.events.emit(ev.Damage, "Bob", 3)
+    assert ctx.get_next_logs() == ["--- Turn 1 begins ---", "Bob takes 3 damage"]
+    assert ctx.get_next_logs() == []
+    ctx.events.emit(ev.Heal, "Bob", 1)
+    assert ctx.get_next_events() == [ev.Heal("Bob", 1)]
+    assert len(ctx.events.history) == 3
+
+@pytest.mark.parametrize("verbosity", [Verbosity.OFF, Verbosity.INFO])
+def test_status_amount_only_resolved_when_recorded(monkeypatch, verbosity):
+    move = Move.model_validate({"id": "t", "amount": 10, "actions": [{"id": "status", "status": [{"id": "poison"}]}]})
+    engine = MoveEngine(MoveSet.model_validate([move]), None, ACTION_HANDLERS)
+    ctx = Battle.from_sides("events", [["fighter_001"], ["fighter_002"]], seed=0).current_context
+    ctx.events.verbosity = verbosity
+    calls = []
+    resolve = Move.get_effective_amount
+    monkeypatch.setattr(Move, "get_effective_amount", lambda self, *args: calls.append(self.id) or resolve(self, *args))
+    engine.execute("t", ctx.sides[0][0], ctx.sides[1][0], ctx)
+    events = ctx.events.drain()
+    assert [e.kind for e in events] == ([] if verbosity == Verbosity.OFF else ["StatusApplied"])
+    assert calls == ([] if verbosity == Verbosity.OFF else ["t"])
@@ -0,0 +1,58 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from core.registry import DATA_ROOT, HEADLESS_SYSTEMS, NullEngine, SystemRegistry, registry
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BATTLE = """
+import json, sys
+from core.registry import registry
+from systems.battle.schema import Battle
+registry.build_all()
+engine = registry.get("battle")
+engine.start(Battle.from_sides("headless", [["fighter_001"], ["fighter_002"]], seed=0))
+steps = 0
+while engine.step() and steps < 500:
+    steps += 1
+audio, display = registry.get("audio"), registry.get("display")
+audio.play_music("x")
+print(json.dumps({
+    "steps": steps,
+    "modules": sorted(m for m in sys.modules if m.split(".")[0] == "pygame" or m.startswith(("systems.audio", "systems.display"))),
+    "engines": [repr(audio), repr(display)],
+}))
+"""
+
+
+def test_headless_battle_never_touches_pygame():
+    # a fresh interpreter: pygame must not even be imported
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "BRANLY_SNAPSHOTS": "0", "BRANLY_HEADLESS": "1"}
+    out = subprocess.run([sys.executable, "-c", BATTLE], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(out)
+    assert result["steps"] > 0
+    assert result["modules"] == []
+    assert result["engines"] == ["NullEngine('audio')", "NullEngine('display')"]
+
+def test_headless_profile():
+    reg = registry.derive(DATA_ROOT, snapshot_dir=None, systems=HEADLESS_SYSTEMS)
+    assert reg.headless
+    assert isinstance(reg.get("display"), NullEngine)
+    assert reg.get("display").anything(1, key=2) is None
+    assert not isinstance(reg.get("moves"), NullEngine)
+    assert not SystemRegistry(DATA_ROOT, systems=["moves", "display"]).headless
+
+def test_profile_cannot_exclude_built_systems():
+    reg = registry.derive(DATA_ROOT, snapshot_dir=None, systems=HEADLESS_SYSTEMS)
+    reg.get("types")
+    with pytest.raises(RuntimeError, match=r"already built outside the profile: \['types'\]"):
+        reg.set_allowed_systems({"moves"})
+    # stand-ins are dropped when the profile changes
+    reg.get("audio")
+    reg.set_allowed_systems(HEADLESS_SYSTEMS | {"audio"})
+    assert "audio" not in reg._systems
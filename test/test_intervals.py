@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from core.dsl.intervals import Dom, holds
+from core.dsl.random_dsl import _check_combinations, check, parse_dsl
+from core.registry import DATA_ROOT
+
+
+def env(**vars):
+    return {name: Dom.of(parse_dsl(v) if isinstance(v, str) and v[:2] in ("r[", "l[") else v) for name, v in vars.items()}
+
+
+@pytest.mark.parametrize("expr, vars", [
+    # every occurrence of x would range independently
+    ("x - x >= 0", {"x": "r[1, 2]"}),
+    ("x + x in [2, 4]", {"x": "l[1, 2]"}),
+    ("x <= x + 1", {"x": "r[0, 5]"}),
+    # operators the values don't support
+    ("x >= 0", {"x": "foo"}),
+    ("x < y", {"x": "l[1, 2]", "y": "bar"}),
+    ("x + y >= 0", {"x": 1, "y": "bar"}),
+    # outside the compiled subset
+    ("x * 2 >= 0", {"x": "r[0, 1]"}),
+    ("x >= 0 or x < 0", {"x": "r[0, 1]"}),
+    # intervals where only points make sense
+    ("x == 1", {"x": "r[0, 1]"}),
+])
+def test_defers(expr, vars):
+    assert holds(expr, env(**vars)) is None
+
+@pytest.mark.parametrize("expr, vars, expected", [
+    ("0 <= x <= 1", {"x": "r[0, 1]"}, True),
+    ("0 <= x <= 1", {"x": "r[0, 1.5]"}, False),
+    ("x >= 0 and x <= 5", {"x": "r[0, 5]"}, True),
+    ("x + y >= 0", {"x": "r[-1, 1]", "y": "r[1, 3]"}, True),
+    ("x - y >= 0", {"x": "r[0, 1]", "y": "r[0, 2]"}, False),
+    ("-x <= 0", {"x": "l[1, 2, 3]"}, True),
+    ("x in ('a', 'b')", {"x": "l[a, b]"}, True),
+    ("x in ('a', 'b')", {"x": "l[a, c]"}, False),
+    ("x not in (3, 4)", {"x": "r[0, 2]"}, True),
+    ("x not in (1, 4)", {"x": "r[0, 2]"}, False),
+    ("x != y", {"x": "r[0, 1]", "y": "r[2, 3]"}, True),
+    ("x != y", {"x": "r[0, 2]", "y": "r[1, 3]"}, False),
+    ("1 <= len(x) <= 3", {"x": "l[a, bc, def]"}, True),
+    ("len(x) < 2", {"x": "l[a, bc]"}, False),
+])
+def test_decides_exactly(expr, vars, expected):
+    assert holds(expr, env(**vars)) is expected
+    if expected:
+        # then evaluating every combination of range endpoints agrees (the
+        # converse doesn't hold: endpoints miss interior values like 1 in r[0, 2])
+        raw = {name: parse_dsl(v) if isinstance(v, str) and v[:2] in ("r[", "l[") else v for name, v in vars.items()}
+        _check_combinations(expr, raw)
+
+def test_check_reports_type_errors_as_value_errors():
+    with pytest.raises(ValueError, match="Check evaluation error"):
+        check("amount >= 0", amount="foo")
+
+def test_bad_move_value_is_a_validation_error():
+    import systems.moves  # noqa: F401
+    from systems.moves.schema import Move
+    move = json.loads((DATA_ROOT / "moves.json").read_bytes())[0]
+    with pytest.raises(ValidationError, match="Check evaluation error"):
+        Move.model_validate({**move, "amount": "foo"})
+
+@pytest.mark.parametrize("expr, vars, ok", [
+    # deferred by holds(), checked at every combination of values
+    ("x - x >= 0", {"x": 5}, True),
+    ("x + x in [2, 4]", {"x": "l[1, 2]"}, True),
+    ("x + x in [2, 3]", {"x": "l[1, 2]"}, False),
+    ("x == 1", {"x": "r[1, 1]"}, True),
+])
+def test_check_falls_back_to_combinations(expr, vars, ok):
+    raw = {name: parse_dsl(v) if isinstance(v, str) else v for name, v in vars.items()}
+    if ok:
+        check(expr, **raw)
+    else:
+        with pytest.raises(ValueError, match="Check failed"):
+            check(expr, **raw)
+
+@pytest.mark.parametrize("expr", ["x * 2 >= 0", "__import__('os').getcwd() != x", "x.startswith('a')"])
+def test_check_never_evaluates_unsupported_expressions(expr):
+    with pytest.raises(ValueError, match="Unsupported check expression"):
+        check(expr, x="abc")
+
+@pytest.mark.parametrize("style, error", [
+    ("{}", None),
+    ("{'color': 'red', 'bold': true}", None),
+    ('{"italic": false}', None),
+    ("red", "dict-like"),
+    ("['bold']", "dict-like"),
+    ("{'color': 'pink'}", "invalid color"),
+    ("{'blink': true}", "invalid style flags"),
+    ("{'bold': 'yes'}", "invalid style flags"),
+])
+def test_text_style(style, error):
+    import systems.moves  # noqa: F401
+    from systems.moves.schema import TextAction
+    if error is None:
+        assert TextAction.model_validate({"id": "text", "style": style}).style == style
+    else:
+        with pytest.raises(ValidationError, match=error):
+            TextAction.model_validate({"id": "text", "style": style})
+    with pytest.raises(ValidationError, match="shorter than 511"):
+        TextAction.model_validate({"id": "text", "text": "x" * 511})
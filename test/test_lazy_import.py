@@ -0,0 +1,33 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHECK = """
+import json, sys
+def systems():
+    return sorted(m for m in sys.modules if m == "systems" or m.startswith("systems."))
+import core.registry
+seen = {"import": systems()}
+core.registry.registry.get("types")
+seen["types"] = systems()
+core.registry.registry.get("moves")
+seen["moves"] = systems()
+print(json.dumps(seen))
+"""
+
+
+def test_systems_are_imported_on_first_get():
+    # a fresh interpreter: this one imported every system already
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "BRANLY_SNAPSHOTS": "0", "BRANLY_HEADLESS": "1"}
+    out = subprocess.run([sys.executable, "-c", CHECK], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    seen = json.loads(out)
+    assert seen["import"] == []
+    assert "systems.types" in seen["types"]
+    assert not {"systems.moves", "systems.fighters", "systems.battle"} & set(seen["types"])
+    # moves pull in what their schemas use, never the display or audio
+    assert "systems.moves" in seen["moves"]
+    assert not {"systems.audio", "systems.display"} & set(seen["moves"])
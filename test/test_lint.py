@@ -0,0 +1,65 @@
+import json
+
+from core.lint import Linter, main
+from core.registry import DATA_ROOT
+
+
+def edit(data_root, name, change):
+    path = data_root / name
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    change(entries)
+    path.write_text(json.dumps(entries), encoding="utf-8")
+
+def lint(data_root) -> list[str]:
+    return [str(error) for error in Linter(data_root, workers=1).run()]
+
+
+def test_shipped_data_is_clean(capsys):
+    assert main([str(DATA_ROOT), "--workers", "1"]) == 0
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err.startswith("0 error(s) in ")
+
+def test_corrupted_data_reports_json_paths(data_root, capsys):
+    def break_moves(moves):
+        moves[2]["actions"] = 5
+        moves[4]["actions"][0]["calc_field"] = "nope"
+    def break_fighters(fighters):
+        fighters[2]["stats"] = 5
+    edit(data_root, "moves.json", break_moves)
+    edit(data_root, "fighters.json", break_fighters)
+    assert main([str(data_root), "--workers", "1"]) == 1
+    out = capsys.readouterr().out.splitlines()
+    assert "moves.json[2].actions: Input should be a valid list" in out
+    assert "moves.json[4]: Value error, MoveContext 'calc_field' must be a valid stat." in out
+    assert any(line.startswith("fighters.json[2].stats: ") for line in out)
+
+def test_unknown_and_disabled_references(data_root):
+    moves = json.loads((data_root / "moves.json").read_text(encoding="utf-8"))
+    disabled = moves[5]["id"]
+    edit(data_root, "moves.json", lambda moves: moves[5].update(enabled=False))
+    edit(data_root, "fighters.json", lambda fighters: fighters[0].update(moves=["nope", disabled, "git_branch"]))
+    errors = lint(data_root)
+    assert "fighters.json[0].moves[0]: references unknown moves id 'nope'" in errors
+    assert f"fighters.json[0].moves[1]: references invalid or disabled moves id '{disabled}'" in errors
+    assert not any(error.startswith("fighters.json[0].moves[2]") for error in errors)
+
+def test_duplicate_ids(data_root):
+    moves = json.loads((data_root / "moves.json").read_text(encoding="utf-8"))
+    edit(data_root, "moves.json", lambda moves: moves.append(dict(moves[0])))
+    assert lint(data_root) == [f"moves.json[{len(moves)}]: duplicate moves id '{moves[0]['id']}' (first at moves.json[0])"]
+
+def test_invalid_jsonl_lines(data_root):
+    # a directory data source: every file in it is a shard
+    moves = json.loads((data_root / "moves.json").read_text(encoding="utf-8"))
+    (data_root / "moves.json").unlink()
+    (data_root / "moves.json").mkdir()
+    lines = [json.dumps(m) for m in moves]
+    lines[1] = lines[1][:-1]
+    lines.insert(3, "")
+    (data_root / "moves.json" / "pack.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    errors = lint(data_root)
+    assert len(errors) == 2
+    assert errors[0].startswith("moves.json/pack.jsonl:2: invalid JSON: ")
+    # the fighters using the unreadable move are reported, blank lines are skipped
+    assert errors[1].endswith(f"references unknown moves id '{moves[1]['id']}'")
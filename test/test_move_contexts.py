@@ -0,0 +1,24 @@
+import pytest
+from pydantic import ValidationError
+
+from systems.moves.schema import Move, MoveContext
+
+
+def test_invalid_override_is_rejected_at_load():
+    # each level is valid alone; the context the damage action runs with is not
+    with pytest.raises(ValidationError, match="cannot sum to negative"):
+        Move.model_validate({"id": "t", "amount": 5, "flat": -3, "actions": [{"id": "damage", "amount": 1}]})
+    with pytest.raises(ValidationError, match="cannot sum to negative"):
+        Move.model_validate({"id": "t", "actions": [
+            {"id": "repeat", "flat": -3, "actions": [{"id": "damage", "amount": 1}]},
+        ]})
+    with pytest.raises(ValidationError, match="calc_field"):
+        Move.model_validate({"id": "t", "actions": [{"id": "damage", "calc_field": "nope"}]})
+
+def test_runtime_contexts_are_trusted():
+    # built by the engine from validated content: no checks on the hot path
+    assert MoveContext.trusted(mult=-1.0).mult == -1.0
+    with pytest.raises(ValidationError):
+        MoveContext(mult=-1.0)
+    merged = MoveContext.trusted().merge(MoveContext.trusted(flat=-5))
+    assert merged.flat == -5
@@ -0,0 +1,36 @@
+import json
+
+from core.registry import registry
+from systems.battle.schema import Battle
+from systems.moves import engine as move_engine
+
+
+def test_engines_share_one_profile_and_exit_dump(tmp_path, monkeypatch):
+    path = tmp_path / "profile.json"
+    hooks = []
+    monkeypatch.setenv("BRANLY_MOVE_PROFILE", str(path))
+    monkeypatch.setattr(move_engine, "_env_profile", None)
+    monkeypatch.setattr(move_engine.atexit, "register", lambda *args: hooks.append(args))
+
+    moves = registry.get("moves").set
+    old = move_engine.create_engine(moves, registry)
+    new = move_engine.create_engine(moves, registry)  # e.g. after a hot reload
+    assert old.profile is new.profile
+    assert len(hooks) == 1
+
+    fighters = list(registry.get("fighters").set.keys())
+    battle = Battle.from_sides("profile", [[fighters[0]], [fighters[-1]]], seed=0)
+    ctx = battle.current_context
+    user, target = ctx.sides[0][0], ctx.sides[1][0]
+    move_id = next(iter(moves.keys()))
+    for engine in (old, new):
+        user.current_stats.charge = 999
+        engine.execute(move_id, user, target, ctx)
+
+    dump, *args = hooks[0]
+    dump(*args)
+    assert json.loads(path.read_text())["moves"][move_id]["calls"] == 2
+
+def test_unset_env_leaves_profiling_off(monkeypatch):
+    monkeypatch.delenv("BRANLY_MOVE_PROFILE", raising=False)
+    assert move_engine.create_engine(registry.get("moves").set, registry).profile is None
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from core import registry as registry_module
+from core.registry import DATA_ROOT, MIN_SHARD_SIZE, registry
+
+
+@pytest.fixture
+def registries(monkeypatch):
+    # the pool path whatever the size and the CPUs of the machine
+    monkeypatch.setattr(registry_module, "MIN_PARALLEL_ENTRIES", 0)
+    monkeypatch.setattr(registry_module, "_usable_cpus", lambda: 2)
+    serial = registry.derive(DATA_ROOT, snapshot_dir=None, validation_workers=0)
+    parallel = registry.derive(DATA_ROOT, snapshot_dir=None, validation_workers=2)
+    for reg in (serial, parallel):
+        reg.get("types")
+    yield serial, parallel
+    if parallel._pool is not None:
+        parallel._pool.shutdown(cancel_futures=True)
+
+def pack(size: int, broken: dict[int, dict] = {}) -> list[dict]:
+    moves = json.loads((DATA_ROOT / "moves.json").read_bytes())
+    return [{**moves[i % len(moves)], "id": f"m{i}", **broken.get(i, {})} for i in range(size)]
+
+def validate(reg, raw):
+    return reg._validate(reg.spec("moves"), json.loads(json.dumps(raw)))
+
+def dump(config) -> list[str]:
+    return [repr(move.model_dump()) for move in config.values()]
+
+
+def test_same_moves(registries):
+    serial, parallel = registries
+    raw = pack(3 * MIN_SHARD_SIZE + 5)
+    assert dump(validate(parallel, raw)) == dump(validate(serial, raw))
+
+def test_same_errors(registries):
+    serial, parallel = registries
+    raw = pack(3 * MIN_SHARD_SIZE, {3: {"actions": [{"id": "nope"}]}, MIN_SHARD_SIZE + 1: {"calc_field": "nope"}, 2 * MIN_SHARD_SIZE + 7: {"actions": 5}})
+    errors = []
+    for reg in (serial, parallel):
+        with pytest.raises(ValidationError) as e:
+            validate(reg, raw)
+        errors.append([(err["loc"], err["type"], err["msg"]) for err in e.value.errors(include_url=False)])
+    assert errors[0] == errors[1]
+    assert [loc[0] for loc, _, _ in errors[0]] == [3, MIN_SHARD_SIZE + 1, 2 * MIN_SHARD_SIZE + 7]
+
+def test_single_cpu_stays_in_process(monkeypatch):
+    monkeypatch.setattr(registry_module, "_usable_cpus", lambda: 1)
+    reg = registry.derive(DATA_ROOT, snapshot_dir=None, validation_workers=4)
+    reg.get("types")
+    validate(reg, pack(registry_module.MIN_PARALLEL_ENTRIES))
+    assert reg._pool is None
@@ -0,0 +1,51 @@
+import json
+
+from core.registry import current_registry, registry
+from systems.battle.schema import Battle
+
+
+def neutral_chart(data_root):
+    path = data_root / "types.json"
+    chart = json.loads(path.read_text())
+    chart["chart"] = {t: [1.0] * len(chart["types"]) for t in chart["types"]}
+    path.write_text(json.dumps(chart))
+
+def test_derived_registry_is_isolated(data_root):
+    neutral_chart(data_root)
+    derived = registry.derive(data_root, snapshot_dir=None)
+    assert derived.get("types") is not registry.get("types")
+    assert derived.get("types").effectiveness("dev", "syst") == 1.0
+    assert registry.get("types").effectiveness("dev", "syst") == 2.0
+    assert "types" not in derived.derive(data_root, snapshot_dir=None)._systems
+
+def test_activate_scopes_current_registry(data_root):
+    derived = registry.derive(data_root, snapshot_dir=None)
+    assert current_registry() is registry
+    with derived.activate():
+        assert current_registry() is derived
+        with registry.activate():
+            assert current_registry() is registry
+        assert current_registry() is derived
+    assert current_registry() is registry
+
+def test_battle_resolves_through_its_registry(data_root):
+    neutral_chart(data_root)
+    derived = registry.derive(data_root, snapshot_dir=None)
+    engine = derived.get("battle")
+    with derived.activate():
+        battle = Battle.from_sides("isolated", [["fighter_001"], ["fighter_001"]], seed=0)
+    engine.start(battle)
+
+    seen = []
+    types = derived.get("types")
+    effectiveness = types.effectiveness
+    types.effectiveness = lambda *args: seen.append(current_registry()) or effectiveness(*args)
+    global_types = registry.get("types")
+    global_types.effectiveness = lambda *args: seen.append("global")
+    try:
+        for _ in range(6):
+            engine.step()
+    finally:
+        del types.effectiveness, global_types.effectiveness
+    assert seen and all(r is derived for r in seen)
+    assert current_registry() is registry  # nothing leaks out of the step
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from core.registry import registry
+from systems.battle.schema import Battle
+
+
+@pytest.fixture
+def derived(data_root):
+    derived = registry.derive(data_root, snapshot_dir=None)
+    derived.build_all()
+    return derived
+
+def edit_moves(data_root, edit):
+    path = data_root / "moves.json"
+    moves = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps(edit(moves), ensure_ascii=False), encoding="utf-8")
+
+def amount(move_engine, move_id):
+    return move_engine.set[move_id].amount
+
+
+def test_move_engine_before_start(derived):
+    engine = derived.get("battle")
+    assert engine.move_engine is derived.get("moves")
+
+def test_reload_rejects_removing_a_referenced_move(derived, data_root):
+    moves = derived.get("moves")
+    edit_moves(data_root, lambda entries: [m for m in entries if m["id"] != "git_branch"])
+    with pytest.warns(UserWarning, match="Keeping previous definitions"):
+        assert derived.reload("moves") is False
+    assert derived.get("moves") is moves
+    assert "git_branch" in derived.get("moves").set
+
+def test_reload_keeps_the_engine_of_running_battles(derived, data_root):
+    engine = derived.get("battle")
+    with derived.activate():
+        battle = Battle.from_sides("reload", [["fighter_001"], ["fighter_001"]], seed=0)
+    engine.start(battle)
+    before = amount(engine.move_engine, "git_branch")
+
+    def bump(entries):
+        for m in entries:
+            if m["id"] == "git_branch":
+                m["amount"] = before + 1
+        return entries
+    edit_moves(data_root, bump)
+    assert derived.reload("moves") is True
+
+    assert amount(derived.get("moves"), "git_branch") == before + 1
+    assert amount(engine.move_engine, "git_branch") == before
+    engine.start(battle)
+    assert amount(engine.move_engine, "git_branch") == before + 1
+
+def test_reload_only_revalidates_changed_entries(derived, data_root):
+    # no watch() first: entries are diffed against the data the moves were built from
+    old = derived.get("moves").set
+    fighters = derived.get("fighters").set
+    edit_moves(data_root, lambda entries: [{**m, "name": "Renamed"} if m["id"] == "hotfix" else m for m in entries])
+    assert derived.reload("moves") is True
+    new = derived.get("moves").set
+    assert new["hotfix"].name == "Renamed"
+    assert all(new[i] is old[i] for i in old.keys() if i != "hotfix")
+    # fighters are only revalidated if they use the edited move
+    for i, fighter in derived.get("fighters").set.items():
+        assert (fighter is fighters[i]) == ("hotfix" not in fighter.moves)
@@ -0,0 +1,78 @@
+import pytest
+
+from core.dsl.resolvable import action_snapshot, per_action_resolution, resolution_snapshot
+from core.registry import DATA_ROOT, registry
+from systems.battle.engine import BattleEngine
+from systems.battle.schema import Battle
+from systems.moves.handlers import ACTION_HANDLERS
+from systems.moves.schema import MoveContext
+
+MOVE = "linear_complexity"  # repeat r[2,6] x damage l[20,25,...,50]
+
+
+class RecordingDamage:
+    """The damage handler, recording the amount each hit reads (twice, to check it is stable)."""
+    def __init__(self, handler):
+        self.handler = handler
+        self.hits = []
+
+    def execute(self, engine, action, user, target, battle_ctx, move_ctx, move):
+        first, second = move_ctx.amount, move_ctx.amount
+        self.hits.append((id(user), first, second))
+        return self.handler.execute(engine, action, user, target, battle_ctx, move_ctx, move)
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = RecordingDamage(ACTION_HANDLERS["damage"])
+    monkeypatch.setitem(ACTION_HANDLERS, "damage", recorder)
+    return recorder
+
+def battle_engine(resolution: str) -> BattleEngine:
+    derived = registry.derive(DATA_ROOT, snapshot_dir=None)
+    engine = BattleEngine(derived.get("battle").config.model_copy(update={"resolution": resolution}), derived)
+    with derived.activate():
+        battle = Battle.from_sides("resolution", [["fighter_005"], ["fighter_005"]], seed=1)
+    engine.start(battle)
+    return engine
+
+def steps(engine: BattleEngine, recorder: RecordingDamage, n: int) -> list[list[tuple]]:
+    """Hits of each of n steps where the active fighter uses MOVE."""
+    per_step = []
+    for _ in range(n):
+        recorder.hits.clear()
+        engine.step((MOVE, None))
+        assert recorder.hits, "the battle ended"
+        per_step.append(list(recorder.hits))
+    return per_step
+
+
+def test_action_resolution_rolls_each_hit(recorder):
+    per_step = steps(battle_engine("action"), recorder, 8)
+    hits = [hit for step in per_step for hit in step]
+    assert all(first == second for _, first, second in hits)  # stable within a hit
+    assert any(len({amount for _, amount, _ in step}) > 1 for step in per_step)
+
+def test_read_resolution_rolls_each_read(recorder):
+    hits = [hit for step in steps(battle_engine("read"), recorder, 8) for hit in step]
+    assert any(first != second for _, first, second in hits)
+
+def test_turn_resolution_is_per_fighter(recorder):
+    # fighter 0 then fighter 1 in each turn
+    per_step = steps(battle_engine("turn"), recorder, 8)
+    assert all(len({amount for _, amount, _ in step}) == 1 for step in per_step)
+    turns = [(per_step[i][0][1], per_step[i + 1][0][1]) for i in range(0, len(per_step), 2)]
+    assert any(a != b for a, b in turns)
+
+def test_action_snapshot_only_under_per_action_resolution():
+    ctx = MoveContext(amount="r[0, 1000000]")
+    with action_snapshot():
+        assert ctx.amount != ctx.amount
+    with per_action_resolution():
+        with action_snapshot():
+            assert ctx.amount == ctx.amount
+        with action_snapshot():
+            first = ctx.amount
+        with action_snapshot():
+            assert ctx.amount != first
+    with resolution_snapshot():
+        assert ctx.amount == ctx.amount
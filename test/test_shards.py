@@ -0,0 +1,78 @@
+import dataclasses
+import json
+import weakref
+
+import pytest
+
+from core import registry as registry_module
+from core import shards
+from core.registry import SystemRegistry
+import systems.moves
+import systems.types
+
+
+@pytest.fixture(autouse=True)
+def _fresh_shared_configs(monkeypatch):
+    monkeypatch.setattr(registry_module, "_shared_configs", weakref.WeakValueDictionary())
+
+@pytest.fixture
+def pack(data_root):
+    """data/moves.json split into data/moves/: two .json shards and a .jsonl file."""
+    moves = json.loads((data_root / "moves.json").read_bytes())
+    root = data_root / "moves"
+    (root / "sub").mkdir(parents=True)
+    third = len(moves) // 3
+    (root / "a.json").write_text(json.dumps(moves[:third]), encoding="utf-8")
+    (root / "sub" / "b.json").write_text(json.dumps(moves[third:2 * third]), encoding="utf-8")
+    (root / "c.jsonl").write_text("\n".join(json.dumps(m) for m in moves[2 * third:]) + "\n", encoding="utf-8")
+    return root
+
+def sharded_registry(data_root, snapshot_dir=None) -> SystemRegistry:
+    reg = SystemRegistry(data_root, snapshot_dir, headless=True)
+    reg.add_spec(systems.types.SPEC)
+    reg.add_spec(dataclasses.replace(systems.moves.SPEC, data_file="moves"))
+    return reg
+
+def dump(config) -> dict[str, str]:
+    return {move.id: repr(move.model_dump()) for move in config.values()}
+
+
+def test_sharded_pack_loads_like_the_single_file(data_root, pack):
+    single = SystemRegistry(data_root, None, headless=True)
+    single.add_spec(systems.types.SPEC)
+    single.add_spec(systems.moves.SPEC)
+    assert dump(sharded_registry(data_root).get("moves").set) == dump(single.get("moves").set)
+
+def test_jsonl_is_split_in_blocks_of_lines(pack, monkeypatch):
+    monkeypatch.setattr(shards, "JSONL_SHARD_LINES", 2)
+    names = [name for name, _ in shards.iter_shards(pack)]
+    lines = len((pack / "c.jsonl").read_text().splitlines())
+    assert names[:2] == ["a.json", "c.jsonl:1"]
+    assert names[-1] == "sub/b.json"
+    assert len([n for n in names if n.startswith("c.jsonl:")]) == (lines + 1) // 2
+
+def test_only_edited_shards_are_revalidated(tmp_path, data_root, pack, monkeypatch):
+    validated = []
+    validate_items = SystemRegistry._validate_items
+    def record(self, spec, raw, shard):
+        validated.append(shard)
+        return validate_items(self, spec, raw, shard)
+    monkeypatch.setattr(SystemRegistry, "_validate_items", record)
+
+    sharded_registry(data_root, tmp_path / "snapshots").get("moves")
+    assert sorted(validated) == ["a.json", "c.jsonl:1", "sub/b.json"]
+
+    validated.clear()
+    moves = json.loads((pack / "a.json").read_text(encoding="utf-8"))
+    moves[0]["name"] = "Edited"
+    (pack / "a.json").write_text(json.dumps(moves), encoding="utf-8")
+    monkeypatch.setattr(registry_module, "_shared_configs", weakref.WeakValueDictionary())
+    reloaded = sharded_registry(data_root, tmp_path / "snapshots").get("moves")
+    assert validated == ["a.json"]
+    assert reloaded.set[moves[0]["id"]].name == "Edited"
+
+def test_invalid_shard_falls_back_to_empty(data_root, pack):
+    (pack / "sub" / "b.json").write_text("[{", encoding="utf-8")
+    with pytest.warns(UserWarning, match="sub/b.json"):
+        config = sharded_registry(data_root).get("moves").set
+    assert len(config) == 0
@@ -0,0 +1,88 @@
+import dataclasses
+import pickle
+import weakref
+
+import pytest
+
+from core import registry as registry_module
+from core.registry import registry
+from core.snapshot import SnapshotStore, snapshot_dir
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("BRANLY_SNAPSHOT_DIR", str(tmp_path / "cache"))
+
+
+class Boom:
+    """Records being unpickled."""
+    loaded = False
+
+    def __reduce__(self):
+        return (_boom, ())
+
+def _boom():
+    Boom.loaded = True
+    return "boom"
+
+
+def test_round_trip(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.store("moves", "key", {"a": 1})
+    assert store.load("moves", "key") == {"a": 1}
+    assert store.load("moves", "other key") is None
+    assert store.load("fighters", "key") is None
+
+def test_header_is_checked_before_unpickling(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.store("moves", "key", {"a": 1})
+    path = tmp_path / "moves.snapshot"
+    header = path.read_bytes().split(b"\n", 3)
+    path.write_bytes(b"\n".join(header[:3]) + b"\n" + pickle.dumps(Boom()))
+    Boom.loaded = False
+    assert store.load("moves", "key") is None
+    assert not Boom.loaded
+
+def test_foreign_snapshot_is_never_unpickled(tmp_path):
+    # a snapshot written by someone else (e.g. shipped in a content pack)
+    SnapshotStore(tmp_path / "theirs").store("moves", "key", Boom())
+    mine = SnapshotStore(tmp_path / "mine")
+    mine.store("fighters", "key", {})
+    (tmp_path / "mine" / "moves.snapshot").write_bytes((tmp_path / "theirs" / "moves.snapshot").read_bytes())
+    Boom.loaded = False
+    assert mine.load("moves", "key") is None
+    assert not Boom.loaded
+
+def test_snapshot_dir_is_outside_the_data_root(tmp_path, monkeypatch, data_root):
+    monkeypatch.delenv("BRANLY_SNAPSHOT_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = snapshot_dir(data_root)
+    assert path.is_relative_to(tmp_path / "cache")
+    assert not path.is_relative_to(data_root)
+    assert snapshot_dir(data_root / ".." / "data") == path
+    assert snapshot_dir(tmp_path / "other") != path
+
+def test_data_edit_and_schema_bump_invalidate(tmp_path, data_root, monkeypatch):
+    # configs already validated by other tests would be shared, not snapshotted
+    monkeypatch.setattr(registry_module, "_shared_configs", weakref.WeakValueDictionary())
+    derived = registry.derive(data_root, snapshot_dir=tmp_path / "snapshots")
+    derived.get("moves")
+    spec = derived.spec("moves")
+    data = (data_root / spec.data_file).read_bytes()
+    key = derived._snapshot_key(spec, data)
+    assert derived._load_snapshot(spec, key) is not None
+
+    edited = data.replace(b'"amount": 50', b'"amount": 51', 1)
+    assert edited != data
+    assert derived._snapshot_key(spec, edited) != key
+    assert derived._load_snapshot(spec, derived._snapshot_key(spec, edited)) is None
+
+    bumped = dataclasses.replace(spec, schema_version=spec.schema_version + 1)
+    assert derived._load_snapshot(bumped, derived._snapshot_key(bumped, data)) is None
+
+    # a dependency's data is part of the key too
+    fighters = derived.spec("fighters")
+    fighters_key = derived._snapshot_key(fighters, (data_root / fighters.data_file).read_bytes())
+    (data_root / spec.data_file).write_bytes(edited)
+    derived._fingerprint = None
+    assert derived._snapshot_key(fighters, (data_root / fighters.data_file).read_bytes()) != fighters_key
@@ -0,0 +1,75 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+import weakref
+
+from core import registry as registry_module
+from core.profiling import StartupProfile, profiled
+from core.registry import DATA_ROOT, registry
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@profiled("leaf")
+def leaf(depth: int = 0) -> int:
+    time.sleep(0.001)
+    return leaf(depth - 1) if depth else 0
+
+
+def test_phases_nest():
+    profile = StartupProfile()
+    with profile.phase("build", "moves"):
+        with profile.phase("validate"):
+            time.sleep(0.01)
+        with profile.phase("build", "types"):
+            pass
+    with profile.phase("read"):
+        pass
+    stats = profile.stats
+    assert set(stats) == {"moves", "types", "-"}
+    build, validate = stats["moves"]["build"], stats["moves"]["validate"]
+    assert validate.wall >= 0.01 and build.wall >= validate.wall
+    # nested phases count in the parent's wall time, not in its self time
+    assert build.self_time < build.wall - validate.wall + 1e-3
+    assert stats["moves"]["build"].calls == stats["types"]["build"].calls == 1
+    report = profile.report()["systems"]
+    assert set(report["moves"]["validate"]) == {"wall", "self", "calls", "blocks"}
+
+def test_profiled_only_records_under_a_build():
+    assert leaf() == 0  # no active profile: nothing to record into
+    profile = StartupProfile()
+    with profile.phase("validate", "moves"):
+        leaf(2)  # recursive calls count once
+        leaf()
+    stats = profile.stats["moves"]
+    assert stats["leaf"].calls == 2
+    assert stats["leaf"].wall >= 0.004
+    assert stats["validate"].self_time <= stats["validate"].wall - stats["leaf"].wall + 1e-3
+
+def test_registry_report_names_each_system(tmp_path, monkeypatch):
+    for _ in range(2):
+        # the second registry loads the snapshots the first one wrote
+        monkeypatch.setattr(registry_module, "_shared_configs", weakref.WeakValueDictionary())
+        derived = registry.derive(DATA_ROOT, snapshot_dir=tmp_path)
+        derived.get("types")
+        derived.get("moves")
+        report = derived.startup_report()["systems"]
+    assert {"types", "moves"} <= set(report)
+    assert {"build", "read", "hash", "snapshot_load", "engine_factory"} <= set(report["moves"])
+    assert "snapshot_load" in report["types"]
+    # timed under its system even outside build()
+    derived._load_snapshot(derived.spec("moves"), "no such key")
+    assert derived.startup_report()["systems"]["moves"]["snapshot_load"]["calls"] == report["moves"]["snapshot_load"]["calls"] + 1
+    assert "-" not in derived.startup_report()["systems"]
+
+def test_startup_report_env(tmp_path):
+    path = tmp_path / "startup.json"
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "BRANLY_SNAPSHOTS": "0", "BRANLY_HEADLESS": "1", "BRANLY_STARTUP_REPORT": str(path)}
+    code = "from core.registry import registry; registry.get('moves')"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+    report = json.loads(path.read_text())
+    assert {"validate", "build"} <= set(report["systems"]["moves"])
+    assert report["systems"]["moves"]["build"]["calls"] == 1
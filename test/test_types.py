@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from core.registry import DATA_ROOT, registry
+from systems.battle.schema import Battle
+from systems.moves.schema import Move
+from systems.types.schema import TypeChart
+
+DOC = DATA_ROOT.parent / "docs" / "type_table.md"
+FRACTIONS = {"½": 0.5, "1/2": 0.5, "0": 0.0, "1": 1.0, "2": 2.0}
+
+
+def doc_table(version: str) -> dict[str, list[float]]:
+    """The type table of docs/type_table.md for a chart version, by attacking type."""
+    section = DOC.read_text(encoding="utf-8").split(f"# version {version}\n", 1)[1]
+    rows = {}
+    for line in section.splitlines()[2:]:
+        if not line.startswith("|"):
+            break
+        cells = [c.strip().strip("*") for c in line.strip("|").split("|")]
+        if not set(cells[0]) <= set("-"):
+            rows[cells[0].lower()] = [FRACTIONS[c] for c in cells[1:]]
+    return rows
+
+def chart_data() -> dict:
+    return json.loads((DATA_ROOT / "types.json").read_text())
+
+def test_chart_rejects_unknown_or_missing_types():
+    data = chart_data()
+    TypeChart.model_validate(data)
+    unknown = {**data, "chart": {**data["chart"], "ops": [1.0] * len(data["types"])}}
+    with pytest.raises(ValidationError, match="don't match types"):
+        TypeChart.model_validate(unknown)
+    missing = {**data, "chart": {t: row for t, row in data["chart"].items() if t != "data"}}
+    with pytest.raises(ValidationError, match="don't match types"):
+        TypeChart.model_validate(missing)
+    with pytest.raises(ValidationError, match="Duplicate types"):
+        TypeChart.model_validate({**data, "types": data["types"] + ["dev"]})
+    short = {**data, "chart": {**data["chart"], "dev": [1.0]}}
+    with pytest.raises(ValidationError, match="'dev' has 1 multipliers"):
+        TypeChart.model_validate(short)
+
+def test_engine_matches_data_and_docs():
+    data = chart_data()
+    table = doc_table(data["version"])
+    engine = registry.get("types")
+    assert list(engine.index) == data["types"]
+    for attack, row in data["chart"].items():
+        assert table[attack] == row
+        assert list(engine.matrix[engine.id(attack)]) == row
+        for target, multiplier in zip(data["types"], row):
+            assert engine.effectiveness(attack, target) == multiplier
+    assert engine.effectiveness("dev", "unknown") == 1.0
+
+def test_array_matches_matrix():
+    np = pytest.importorskip("numpy")
+    engine = registry.get("types")
+    array = engine.array()
+    assert array.shape == (len(engine.index),) * 2
+    assert np.array_equal(array, np.array(engine.matrix))
+    assert array[engine.ids(["dev", "proj"]), engine.ids(["syst", "team"])].tolist() == [2.0, 0.0]
+    assert not array.flags.writeable
+
+@pytest.mark.parametrize("move_type, multiplier", [("dev", 2.0), ("opti", 0.5), ("proj", 1.0)])
+def test_effective_amount_applies_the_type_multiplier(move_type, multiplier):
+    # a data fighter (no STAB for these moves) against a syst fighter
+    ctx = Battle.from_sides("types", [["fighter_004"], ["fighter_003"]], seed=0).current_context
+    user, target = ctx.sides[0][0], ctx.sides[1][0]
+    neutral = Move.model_validate({"id": "neutral", "amount": 10}).get_effective_amount(user, target)
+    typed = Move.model_validate({"id": "typed", "type": move_type, "amount": 10})
+    assert typed.type_effectiveness(user, target) == multiplier
+    assert typed.get_effective_amount(user, target) == pytest.approx(neutral * multiplier)